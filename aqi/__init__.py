@@ -0,0 +1,25 @@
+"""
+Core AQI package: OCR text parsing, PM2.5 → AQI computation,
+status classification, compact reading types and local CSV storage.
+
+Heavy dependencies stay out of this namespace: `aqi.ocr` imports
+pytesseract/PIL and `aqi.gui` imports tkinter only when used.
+"""
+from .index import PM25_BREAKPOINTS, Category, classify_air_quality, compute_aqi_from_pm25
+from .parsing import extract_pm25, filter_and_validate, normalize_text, parse_reading
+from .reading import Reading, ReadingBatch
+from .storage import LocalStorage
+
+__all__ = [
+    "PM25_BREAKPOINTS",
+    "Category",
+    "LocalStorage",
+    "Reading",
+    "ReadingBatch",
+    "classify_air_quality",
+    "compute_aqi_from_pm25",
+    "extract_pm25",
+    "filter_and_validate",
+    "normalize_text",
+    "parse_reading",
+]
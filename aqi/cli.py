@@ -0,0 +1,340 @@
+"""
+Headless command line interface.
+
+    python -m aqi ingest "PM2.5: 85"        # raw OCR text (or lines on stdin)
+    python -m aqi ingest --image img.png    # run OCR first (loads Tesseract)
+    python -m aqi latest
+    python -m aqi query --from 2025-12-01 --to "2025-12-31 23:59:59"
+    python -m aqi recompute                 # re-derive AQI/Status from PM2.5
+    python -m aqi serve --port 8000         # local HTTP read API
+    python -m aqi replay --diff             # re-parse the raw OCR log
+    python -m aqi --segments DIR migrate    # move the CSV into segments
+
+Only the stdlib and the light core modules are imported at startup;
+OCR is loaded on demand. Keep it that way: benchmarks/bench_startup.py
+checks the cold-start time.
+"""
+import argparse
+import csv
+import sys
+
+from .config import (
+    CSV_FILE,
+    CSV_HEADER,
+    INGEST_BATCH,
+    OCR_LOG_FILE,
+    OUTLIER_MODE,
+    OUTLIER_WINDOW,
+    QUARANTINE_FILE,
+    SEGMENTS_DIR,
+)
+from .index import classify_air_quality, compute_aqi_from_pm25
+from .parsing import parse_reading
+from .reading import Reading, parse_timestamp
+from .storage import LocalStorage, open_storage
+
+
+def _format_record(record):
+    if not isinstance(record, dict):
+        record = record.to_dict()
+    return f"{record['Timestamp']} | PM2.5:{record['PM2.5']} | AQI:{record['AQI']} | {record['Status']}"
+
+
+def _storage(args):
+    return open_storage(args.csv, args.segments)
+
+
+def _print_json(obj):
+    import json
+
+    print(json.dumps(obj, ensure_ascii=False))
+
+# =====================================================
+# SUBCOMMANDS
+# =====================================================
+
+def cmd_ingest(args):
+    storage = _storage(args)
+    sources = []
+    if args.image:
+        from .ocr import ocr_image
+        from .ocrlog import OCRLog
+
+        log = OCRLog(args.ocr_log)
+        sources.extend(ocr_image(path, log=log) for path in args.image)
+    sources.extend((text, None) for text in args.text)
+    # Readings given up front are written in one batch; stdin may be a
+    # live feed, so those are stored as they arrive
+    batch_size = INGEST_BATCH
+    if not sources:
+        sources = ((line, None) for line in sys.stdin if line.strip())
+        batch_size = 1
+
+    outliers = None
+    if args.outliers != "off":
+        from .outlier import QuarantineStorage, seeded_filter
+
+        # Only create the quarantine CSV when it can receive readings
+        quarantine = None
+        if args.outliers == "quarantine":
+            quarantine = QuarantineStorage(args.quarantine)
+        outliers = seeded_filter(
+            storage,
+            args.outliers,
+            window=args.window,
+            seconds=args.window_seconds,
+            quarantine=quarantine,
+        )
+
+    stored = rejected = quarantined = 0
+    pending = []
+    for raw_text, captured_at in sources:
+        result = parse_reading(raw_text, timestamp=captured_at)
+        if result is None:
+            rejected += 1
+            print(f"❌ REJECTED: {raw_text.strip()!r}", file=sys.stderr)
+            continue
+        if outliers is not None:
+            candidate = result
+            result, flagged = outliers.process(result)
+            if result is None:
+                quarantined += 1
+                print("🚧 QUARANTINED:", _format_record(candidate), file=sys.stderr)
+                continue
+            if flagged:
+                print("⚠️ OUTLIER:", _format_record(result), file=sys.stderr)
+        pending.append(result)
+        if len(pending) >= batch_size:
+            stored += _store(storage, pending, args.quiet)
+            pending = []
+    stored += _store(storage, pending, args.quiet)
+    summary = f"{stored} stored, {rejected} rejected"
+    if quarantined:
+        summary += f", {quarantined} quarantined"
+    print(summary, file=sys.stderr)
+    return 0 if stored or not rejected else 1
+
+
+def _store(storage, readings, quiet):
+    if readings:
+        storage.save_many(readings)
+    if not quiet:
+        for reading in readings:
+            print("✅ STORED:", _format_record(reading))
+    return len(readings)
+
+
+def cmd_latest(args):
+    record = _storage(args).latest()
+    if record is None:
+        print("📁 No data yet", file=sys.stderr)
+        return 1
+    if args.json:
+        _print_json(record)
+    else:
+        print(_format_record(record))
+    return 0
+
+
+def cmd_query(args):
+    for bound in (args.start, args.end):
+        if bound is not None and parse_timestamp(bound) is None:
+            print(f"Invalid timestamp: {bound!r}", file=sys.stderr)
+            return 2
+    records = _storage(args).query(args.start, args.end)
+    if args.json:
+        _print_json(list(records))
+        return 0
+    writer = csv.writer(sys.stdout, lineterminator="\n")
+    writer.writerow(CSV_HEADER)
+    for record in records:
+        writer.writerow([record[key] for key in CSV_HEADER])
+    return 0
+
+
+def cmd_recompute(args):
+    storage = _storage(args)
+    changed = skipped = 0
+    records = []
+    # rows() rather than readings(): undated legacy rows must survive the
+    # rewrite, so those are recomputed in place as dicts
+    for record in storage.rows():
+        if not isinstance(record.get("PM2.5"), float):
+            # row_to_record leaves a non-numeric PM2.5 as text: keep the row
+            skipped += 1
+            records.append(record)
+            continue
+        try:
+            fresh = Reading.from_dict(record).recomputed()
+            aqi, status = fresh.aqi, fresh.status
+        except (KeyError, TypeError, ValueError):
+            aqi = compute_aqi_from_pm25(record["PM2.5"])
+            status = classify_air_quality(aqi)
+            fresh = {**record, "AQI": aqi, "Status": status}
+        if (aqi, status) != (record["AQI"], record["Status"]):
+            changed += 1
+        records.append(fresh)
+    if changed and not args.dry_run:
+        storage.rewrite(records)
+    verb = "would change" if args.dry_run else "changed"
+    summary = f"{len(records)} readings, {changed} {verb}"
+    if skipped:
+        summary += f", {skipped} skipped (PM2.5 not a number)"
+    print(summary, file=sys.stderr)
+    return 0
+
+
+def cmd_replay(args):
+    import time
+
+    from .ocrlog import OCRLog, diff_readings, merge_readings, replay
+    from .outlier import quarantined_timestamps
+
+    start = time.perf_counter()
+    results = list(replay(OCRLog(args.ocr_log), workers=args.workers))
+    elapsed = time.perf_counter() - start
+    # Readings the outlier filter held back were logged but never stored;
+    # leave them out so --diff/--write don't bring them back
+    quarantined = quarantined_timestamps(args.quarantine)
+    logged = len(results)
+    results = [(ts, record) for ts, record in results if ts not in quarantined]
+    skipped = logged - len(results)
+    accepted = sum(1 for _, record in results if record is not None)
+    rate = len(results) / elapsed if elapsed else 0
+    summary = (
+        f"{len(results)} logged, {accepted} accepted, {len(results) - accepted} rejected "
+        f"({rate:,.0f} entries/s)"
+    )
+    if skipped:
+        summary += f", {skipped} quarantined skipped"
+    print(summary, file=sys.stderr)
+
+    if args.diff or args.write:
+        storage = _storage(args)
+    if args.diff:
+        diff = diff_readings(storage.readings(), results)
+        for record in diff["added"]:
+            print("+", _format_record(record))
+        for record in diff["removed"]:
+            print("-", _format_record(record))
+        for old, new in diff["changed"]:
+            print("~", _format_record(old), "→", _format_record(new))
+        print(
+            f"{len(diff['added'])} added, {len(diff['removed'])} removed, "
+            f"{len(diff['changed'])} changed",
+            file=sys.stderr,
+        )
+    if args.write:
+        # rows(), not readings(): undated legacy rows are kept as they are
+        storage.rewrite(merge_readings(storage.rows(), results))
+        print(f"✅ Rewrote {storage.location}", file=sys.stderr)
+    return 0
+
+
+def cmd_compact_log(args):
+    from .ocrlog import OCRLog
+
+    before, after = OCRLog(args.ocr_log).compact()
+    if not before:
+        print(f"📁 No OCR log at {args.ocr_log}", file=sys.stderr)
+        return 0
+    print(f"✅ Compacted {args.ocr_log}: {before:,} → {after:,} bytes", file=sys.stderr)
+    return 0
+
+
+def cmd_serve(args):
+    from .server import serve
+
+    serve(_storage(args), args.host, args.port, verbose=args.verbose)
+    return 0
+
+
+def cmd_migrate(args):
+    from .segments import SegmentedStorage
+
+    if not args.segments:
+        print("migrate needs --segments DIR", file=sys.stderr)
+        return 2
+    target = SegmentedStorage(args.segments)
+    if target.get_history():
+        print(f"❌ {target.location} already holds readings", file=sys.stderr)
+        return 1
+    target.rewrite(LocalStorage(args.csv).rows())
+    print(
+        f"✅ {target.get_history()} readings from {args.csv} → "
+        f"{len(target.segments())} segments in {target.location}",
+        file=sys.stderr,
+    )
+    return 0
+
+# =====================================================
+# ENTRY POINT
+# =====================================================
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="aqi", description="Headless PM2.5 → AQI storage tools"
+    )
+    parser.add_argument("--csv", default=CSV_FILE, help="readings CSV file")
+    parser.add_argument(
+        "--segments", default=SEGMENTS_DIR,
+        help="use rotated, compressed segments in this folder instead of --csv",
+    )
+    parser.add_argument("--ocr-log", default=OCR_LOG_FILE, help="raw OCR log file")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("ingest", help="validate raw OCR text and store it")
+    p.add_argument("text", nargs="*", help="raw OCR text (default: stdin lines)")
+    p.add_argument("--image", action="append", default=[], help="run OCR on an image")
+    p.add_argument("-q", "--quiet", action="store_true")
+    p.add_argument(
+        "--outliers", choices=("off", "flag", "quarantine"), default=OUTLIER_MODE,
+        help="rolling median/MAD check before storing",
+    )
+    p.add_argument("--window", type=int, default=OUTLIER_WINDOW, help="outlier window (readings)")
+    p.add_argument("--window-seconds", type=float, help="also limit the window by age")
+    p.add_argument("--quarantine", default=QUARANTINE_FILE, help="CSV for quarantined readings")
+    p.set_defaults(func=cmd_ingest)
+
+    p = sub.add_parser("latest", help="show the most recent reading")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_latest)
+
+    p = sub.add_parser("query", help="print readings in a time range")
+    p.add_argument("--from", dest="start", help="inclusive start (YYYY-MM-DD[ HH:MM:SS])")
+    p.add_argument("--to", dest="end", help="inclusive end (YYYY-MM-DD[ HH:MM:SS])")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_query)
+
+    p = sub.add_parser("recompute", help="re-derive AQI and Status from PM2.5")
+    p.add_argument("--dry-run", action="store_true")
+    p.set_defaults(func=cmd_recompute)
+
+    p = sub.add_parser("replay", help="re-parse the raw OCR log with the current parser")
+    p.add_argument("--workers", type=int, default=1, help="parser processes")
+    p.add_argument("--diff", action="store_true", help="show changes against the CSV")
+    p.add_argument("--write", action="store_true", help="rewrite the CSV from the replay")
+    p.add_argument(
+        "--quarantine", default=QUARANTINE_FILE,
+        help="skip readings held back in this quarantine CSV",
+    )
+    p.set_defaults(func=cmd_replay)
+
+    p = sub.add_parser("compact-log", help="rewrite the raw OCR log as one gzip member")
+    p.set_defaults(func=cmd_compact_log)
+
+    p = sub.add_parser("migrate", help="copy --csv readings into --segments")
+    p.set_defaults(func=cmd_migrate)
+
+    p = sub.add_parser("serve", help="serve /latest, /range and /summary over HTTP")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8000)
+    p.add_argument("-v", "--verbose", action="store_true", help="log every request")
+    p.set_defaults(func=cmd_serve)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
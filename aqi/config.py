@@ -0,0 +1,42 @@
+import os
+
+# =====================================================
+# CONFIGURATION
+# =====================================================
+
+# Project root (the folder that contains the `aqi` package and the scripts)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMAGE_FOLDER = os.path.join(BASE_DIR, "input_images")
+CSV_FILE = os.path.join(BASE_DIR, "aqi_readings.csv")
+OCR_LOG_FILE = os.path.join(BASE_DIR, "ocr_log.jsonl.gz")
+QUARANTINE_FILE = os.path.join(BASE_DIR, "aqi_quarantine.csv")
+
+# Segmented storage (aqi/segments.py). None keeps the single CSV_FILE;
+# set a folder, e.g. os.path.join(BASE_DIR, "aqi_segments"), to rotate.
+SEGMENTS_DIR = None
+SEGMENT_PERIOD = "month"          # "month" or "day"
+SEGMENT_COMPRESSION = "gzip"      # "gzip" or "zstd" (needs zstandard / Python 3.14+)
+RETENTION_DROP_AFTER = None       # drop segments older than N periods
+RETENTION_DOWNSAMPLE_AFTER = None # downsample segments older than N periods...
+RETENTION_DOWNSAMPLE_TO = "hour"  # ...to hourly ("hour") or daily ("day") means
+
+# Adjust this path to your actual Tesseract installation,
+# or set the TESSERACT_CMD environment variable.
+TESSERACT_CMD = os.environ.get(
+    "TESSERACT_CMD", r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+)
+
+# Whitelist digits, dot, and letters needed for "PM" etc. [web:60][web:49]
+OCR_CONFIG = "--psm 11 -c tessedit_char_whitelist=0123456789.PM"
+
+# CSV layout shared by every module that reads or writes readings
+CSV_HEADER = ["Timestamp", "PM2.5", "AQI", "Status"]
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+INGEST_BATCH = 500           # readings per storage write in `aqi ingest`
+
+# Outlier filter (aqi/outlier.py): "off", "flag" or "quarantine"
+OUTLIER_MODE = "off"
+OUTLIER_WINDOW = 50          # readings in the rolling window
+OUTLIER_THRESHOLD = 3.5      # |modified z-score| above this is an outlier
+OUTLIER_MIN_SAMPLES = 5      # don't judge until the window has this many
+OUTLIER_MIN_MAD = 1.0        # µg/m³ floor so a flat series doesn't flag noise
@@ -0,0 +1,266 @@
+"""
+Tkinter dashboard for the offline air quality monitor.
+
+tkinter is imported inside the methods that build widgets, so importing
+this module (or the `aqi` package) does not load Tk.
+"""
+import os
+import threading
+from datetime import datetime
+
+from .config import CSV_FILE, IMAGE_FOLDER, OCR_LOG_FILE, OUTLIER_MODE
+from .index import CATEGORY_EMOJI
+from .ocr import ocr_image
+from .ocrlog import OCRLog
+from .outlier import seeded_filter
+from .parsing import parse_reading
+from .storage import open_storage
+
+# =====================================================
+# GUI DASHBOARD
+# =====================================================
+class AQIApp:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("OFFLINE AIR QUALITY MONITOR")
+        self.root.geometry("800x600")
+        self.root.configure(bg="#1a1a1a")
+
+        self.storage = open_storage(CSV_FILE)
+        self.ocr_log = OCRLog(OCR_LOG_FILE)
+        self.outliers = seeded_filter(self.storage, OUTLIER_MODE)
+
+        self.setup_ui()
+        os.makedirs(IMAGE_FOLDER, exist_ok=True)
+
+    def setup_ui(self):
+        import tkinter as tk
+
+        # MAIN TITLE
+        title = tk.Label(
+            self.root,
+            text="AIR QUALITY MONITOR",
+            font=("Arial", 24, "bold"),
+            fg="#00ff88",
+            bg="#1a1a1a",
+        )
+        title.pack(pady=5)
+
+        # SMALL SUBTITLE
+        subtitle = tk.Label(
+            self.root,
+            text="PM2.5 → AQI → Status", # (for one fixed location)
+            font=("Arial", 11),
+            fg="#cccccc",
+            bg="#1a1a1a",
+        )
+        subtitle.pack(pady=(0, 10))
+
+        main_frame = tk.Frame(self.root, bg="#1a1a1a")
+        main_frame.pack(expand=True, fill="both", padx=40, pady=20)
+
+        # LEFT: current reading
+        left_frame = tk.Frame(main_frame, bg="#1a1a1a")
+        left_frame.pack(side="left", fill="both", expand=True)
+
+        # HEADING ABOVE BIG NUMBER
+        tk.Label(
+            left_frame,
+            text="AQI VALUE (Air Quality Index)",
+            font=("Arial", 14, "bold"),
+            fg="#ffffff",
+            bg="#1a1a1a",
+        ).pack(pady=(0, 5))
+
+        self.aqi_label = tk.Label(
+            left_frame,
+            text="--",
+            font=("Arial", 72, "bold"),
+            fg="#00ff88",
+            bg="#2d2d2d",
+            width=8,
+            height=2,
+        )
+        self.aqi_label.pack(pady=10)
+
+        # HEADING + STATUS NAME
+        tk.Label(
+            left_frame,
+            text="AQI CATEGORY",
+            font=("Arial", 14, "bold"),
+            fg="#ffffff",
+            bg="#1a1a1a",
+        ).pack(pady=(10, 0))
+
+        self.status_label = tk.Label(
+            left_frame,
+            text="No Data",
+            font=("Arial", 22, "bold"),
+            fg="#ffcc00",
+            bg="#1a1a1a",
+        )
+        self.status_label.pack(pady=5)
+
+        # HEADING + PM2.5
+        tk.Label(
+            left_frame,
+            text="PM2.5 CONCENTRATION (µg/m³)",
+            font=("Arial", 12),
+            fg="#ffffff",
+            bg="#1a1a1a",
+        ).pack(pady=(10, 0))
+
+        self.pm_label = tk.Label(
+            left_frame,
+            text="-- µg/m³",
+            font=("Arial", 16),
+            fg="#cccccc",
+            bg="#1a1a1a",
+        )
+        self.pm_label.pack()
+
+        self.time_label = tk.Label(
+            left_frame,
+            text="Last updated: --",
+            font=("Arial", 12),
+            fg="#888888",
+            bg="#1a1a1a",
+        )
+        self.time_label.pack(pady=(5, 0))
+
+        # RIGHT: controls + history + status log
+        right_frame = tk.Frame(main_frame, bg="#1a1a1a", width=250)
+        right_frame.pack(side="right", fill="y")
+        right_frame.pack_propagate(False)
+
+        tk.Label(
+            right_frame,
+            text="CONTROLS",
+            font=("Arial", 16, "bold"),
+            fg="#00ff88",
+            bg="#1a1a1a",
+        ).pack(pady=10)
+
+        tk.Button(
+            right_frame,
+            text="Process Image",
+            font=("Arial", 14),
+            bg="#00ff88",
+            fg="black",
+            command=self.process_image,
+            relief="flat",
+            padx=20,
+            pady=10,
+        ).pack(pady=10, fill="x")
+
+        tk.Label(
+            right_frame,
+            text="HISTORY",
+            font=("Arial", 14, "bold"),
+            fg="#ffffff",
+            bg="#1a1a1a",
+        ).pack(pady=(30, 10))
+
+        self.history_label = tk.Label(
+            right_frame,
+            text="0 readings",
+            font=("Arial", 16, "bold"),
+            fg="#cccccc",
+            bg="#1a1a1a",
+        )
+        self.history_label.pack()
+
+        tk.Label(
+            right_frame,
+            text="STATUS LOG",
+            font=("Arial", 12, "bold"),
+            fg="#888888",
+            bg="#1a1a1a",
+        ).pack(pady=(20, 5))
+
+        self.status_text = tk.Text(
+            right_frame,
+            height=6,
+            width=28,
+            bg="#2d2d2d",
+            fg="#cccccc",
+            font=("Consolas", 10),
+        )
+        self.status_text.pack(pady=5, fill="x")
+
+    def log_status(self, message):
+        self.status_text.insert(
+            "end", f"{datetime.now().strftime('%H:%M:%S')}: {message}\n"
+        )
+        self.status_text.see("end")
+
+    def update_dashboard(self, reading):
+        status = reading.status
+        emoji = CATEGORY_EMOJI.get(status, "")
+
+        # Number = AQI value
+        self.aqi_label.config(text=str(reading.aqi), fg="#00ff88")
+
+        # Category name
+        status_text = f"{emoji}  {status}"
+        self.status_label.config(text=status_text, fg="#ffcc00")
+
+        # PM2.5
+        self.pm_label.config(text=f"{reading.pm25:.1f} µg/m³", fg="#00ff88")
+
+        # Time label with explanation
+        self.time_label.config(
+            text=f"Last updated: {reading.time_text}", fg="#cccccc"
+        )
+
+        self.history_label.config(text=f"{self.storage.get_history()} readings")
+        self.log_status(f"NEW: AQI {reading.aqi} - {status}")
+
+    def process_image_thread(self, image_path):
+        try:
+            self.log_status(f"Processing: {os.path.basename(image_path)}")
+            raw_text, captured_at = ocr_image(image_path, log=self.ocr_log)
+            self.log_status(f"OCR: {repr(raw_text.strip())}")
+
+            result = parse_reading(raw_text, timestamp=captured_at)
+            candidate = result
+            result, flagged = self.outliers.process(result)
+            if flagged:
+                self.root.after(
+                    0, lambda: self.log_status(f"OUTLIER: PM2.5 {candidate.pm25}")
+                )
+            if result:
+                self.storage.save(result)
+                self.root.after(0, lambda: self.update_dashboard(result))
+            elif not flagged:
+                self.root.after(
+                    0, lambda: self.log_status("REJECTED: No valid PM2.5 data")
+                )
+        except Exception as e:
+            self.root.after(0, lambda: self.log_status(f"Error: {str(e)}"))
+
+    def process_image(self):
+        from tkinter import filedialog
+
+        os.makedirs(IMAGE_FOLDER, exist_ok=True)
+        filename = filedialog.askopenfilename(
+            initialdir=IMAGE_FOLDER,
+            title="Select AQI Image",
+            filetypes=[("Image files", "*.png *.jpg *.jpeg")],
+        )
+        if filename:
+            threading.Thread(
+                target=self.process_image_thread, args=(filename,), daemon=True
+            ).start()
+
+    def on_closing(self):
+        self.root.destroy()
+
+
+def main():
+    import tkinter as tk
+
+    root = tk.Tk()
+    app = AQIApp(root)
+    root.protocol("WM_DELETE_WINDOW", app.on_closing)
+    root.mainloop()
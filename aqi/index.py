@@ -0,0 +1,110 @@
+"""
+AQI computation from PM2.5 and status classification.
+"""
+from enum import IntEnum
+
+# PM2.5 breakpoints (µg/m³) and AQI ranges – from AQI spec / article [page:0][web:40]
+PM25_BREAKPOINTS = [
+    # (C_low, C_high, I_low, I_high)
+    (0.0,   12.0,    0,   50),   # Good
+    (12.1,  35.4,   51,  100),   # Moderate
+    (35.5,  55.4,  101,  150),   # Unhealthy for Sensitive Groups
+    (55.5, 150.4,  151,  200),   # Unhealthy
+    (150.5, 250.4, 201,  300),   # Very Unhealthy
+    (250.5, 500.4, 301,  500),   # Hazardous
+]
+
+# Emoji shown next to each category on the dashboard
+CATEGORY_EMOJI = {
+    "Good": "🟢",
+    "Moderate": "🟡",
+    "Unhealthy for Sensitive Groups": "🟠",
+    "Unhealthy": "🔴",
+    "Very Unhealthy": "🟣",
+    "Hazardous": "⚫",
+    "Unknown": "⚪",
+}
+
+# =====================================================
+# AQI COMPUTATION FROM PM2.5
+# =====================================================
+
+def compute_aqi_from_pm25(pm25):
+    """
+    Convert PM2.5 concentration (µg/m³) to AQI using
+    the standard linear interpolation formula and PM2.5 breakpoints. [page:0][web:40]
+    """
+    if pm25 is None:
+        return None
+
+    for C_low, C_high, I_low, I_high in PM25_BREAKPOINTS:
+        if C_low <= pm25 <= C_high:
+            aqi = ((I_high - I_low) / (C_high - C_low)) * (pm25 - C_low) + I_low
+            return round(aqi)
+
+    return None
+
+# =====================================================
+# AQI CATEGORY
+# =====================================================
+
+class Category(IntEnum):
+    """The standard 6-level AQI scale, small enough to store in one byte."""
+
+    UNKNOWN = 0
+    GOOD = 1
+    MODERATE = 2
+    UNHEALTHY_FOR_SENSITIVE_GROUPS = 3
+    UNHEALTHY = 4
+    VERY_UNHEALTHY = 5
+    HAZARDOUS = 6
+
+    @property
+    def label(self):
+        return CATEGORY_LABELS[self]
+
+    @classmethod
+    def from_label(cls, label):
+        """Category for a stored Status text, UNKNOWN if not a standard name."""
+        return _CATEGORY_BY_LABEL.get(label, cls.UNKNOWN)
+
+
+CATEGORY_LABELS = [
+    "Unknown",
+    "Good",
+    "Moderate",
+    "Unhealthy for Sensitive Groups",
+    "Unhealthy",
+    "Very Unhealthy",
+    "Hazardous",
+]
+_CATEGORY_BY_LABEL = {label: Category(i) for i, label in enumerate(CATEGORY_LABELS)}
+
+
+def aqi_category(aqi):
+    """
+    Map AQI numeric value to its Category,
+    matching the standard 6-level AQI scale. [page:0]
+    """
+    if aqi is None:
+        return Category.UNKNOWN
+    if aqi <= 50:
+        return Category.GOOD
+    elif aqi <= 100:
+        return Category.MODERATE
+    elif aqi <= 150:
+        return Category.UNHEALTHY_FOR_SENSITIVE_GROUPS
+    elif aqi <= 200:
+        return Category.UNHEALTHY
+    elif aqi <= 300:
+        return Category.VERY_UNHEALTHY
+    else:
+        return Category.HAZARDOUS
+
+
+def classify_air_quality(aqi):
+    """
+    Map AQI numeric value to category text,
+    matching the standard 6-level AQI scale. [page:0]
+    """
+    return CATEGORY_LABELS[aqi_category(aqi)]
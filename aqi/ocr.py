@@ -0,0 +1,60 @@
+"""
+Tesseract OCR on local images.
+
+pytesseract and PIL are imported on first use so that storage-only
+and CLI consumers of the `aqi` package never pay for them.
+"""
+from datetime import datetime
+
+from .config import OCR_CONFIG, TESSERACT_CMD, TIMESTAMP_FORMAT
+
+_backend = None
+
+
+def _load_backend():
+    """Import pytesseract + PIL once and configure the Tesseract path."""
+    global _backend
+    if _backend is None:
+        import pytesseract
+        from PIL import Image
+
+        pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
+        _backend = (pytesseract, Image)
+    return _backend
+
+# =====================================================
+# OCR PREPROCESSING
+# =====================================================
+
+def preprocess_image(image_path):
+    """
+    Open image, convert to grayscale and apply simple thresholding
+    to improve OCR on digital displays.
+    """
+    _, Image = _load_backend()
+    img = Image.open(image_path).convert("L")
+    img = img.point(lambda x: 0 if x < 160 else 255, "1")
+    return img
+
+
+def image_to_text(image_path, config=OCR_CONFIG):
+    """Preprocess an image and return Tesseract's raw text."""
+    pytesseract, _ = _load_backend()
+    img = preprocess_image(image_path)
+    return pytesseract.image_to_string(img, config=config)
+
+
+def ocr_image(image_path, config=OCR_CONFIG, log=None):
+    """
+    Run OCR on an image and return (raw_text, captured_at).
+    If `log` (an OCRLog) is given, the raw text is appended to it so the
+    reading can be re-parsed later without re-running Tesseract.
+    Pass captured_at to parse_reading so both agree on the time.
+    """
+    raw_text = image_to_text(image_path, config=config)
+    captured_at = datetime.now().strftime(TIMESTAMP_FORMAT)
+    if log is not None:
+        from .ocrlog import image_hash
+
+        log.append(raw_text, captured_at, image_hash(image_path), config)
+    return raw_text, captured_at
@@ -0,0 +1,329 @@
+"""
+Replayable raw OCR log.
+
+Every OCR run appends one JSON line to a gzip file:
+
+    {"time": "2025-12-23 17:38:00", "sha256": "<image hash>",
+     "config": "--psm 11 ...", "text": "PM2.S 85 ..."}
+
+Each append is written as its own gzip member (`append_many` writes a
+whole batch as one member); gzip readers treat the concatenation as a
+single stream. Single-entry members compress poorly, so `compact()`
+(`python -m aqi compact-log`, e.g. nightly from cron) rewrites the log
+as one member. A member cut short by a crash mid-append is skipped when
+reading: the entries after it are still replayed, and compaction drops
+the damage for good.
+
+`replay` feeds the log back through the *current* parser, so parser
+improvements can regenerate or diff the readings store without
+re-running Tesseract.
+"""
+import gzip
+import hashlib
+import json
+import os
+import zlib
+
+from .config import OCR_LOG_FILE
+from .parsing import parse_reading
+from .reading import Reading, as_reading, to_epoch
+from .storage import exclusive_lock
+
+_MISSING = object()
+_GZIP_MAGIC = b"\x1f\x8b\x08"
+
+
+def image_hash(image_path):
+    """SHA-256 of the image file contents."""
+    digest = hashlib.sha256()
+    with open(image_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _encode(entry):
+    return json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+# =====================================================
+# LOG FILE
+# =====================================================
+
+class OCRLog:
+    def __init__(self, path=OCR_LOG_FILE):
+        self.path = path
+        # Appends and compaction take turns, across processes
+        self.lock_path = f"{path}.lock"
+
+    def append(self, raw_text, captured_at, image_sha256="", ocr_config=""):
+        self.append_many([{
+            "time": captured_at,
+            "sha256": image_sha256,
+            "config": ocr_config,
+            "text": raw_text,
+        }])
+
+    def append_many(self, entries):
+        """Append a batch of entries as a single gzip member."""
+        data = "".join(_encode(entry) for entry in entries)
+        if not data:
+            return
+        with exclusive_lock(self.lock_path):
+            with gzip.open(self.path, "at", encoding="utf-8") as f:
+                f.write(data)
+
+    def compact(self):
+        """
+        Rewrite the log as a single gzip member, dropping damaged members.
+        Returns (size before, size after) in bytes.
+        """
+        if not os.path.exists(self.path):
+            return 0, 0
+        with exclusive_lock(self.lock_path):
+            before = os.path.getsize(self.path)
+            tmp = f"{self.path}.tmp"
+            with gzip.open(tmp, "wt", encoding="utf-8") as f:
+                for block in self.blocks():
+                    f.write("".join(_encode(entry) for entry in _decode_block(block)))
+            os.replace(tmp, self.path)
+        return before, os.path.getsize(self.path)
+
+    def blocks(self, block_size=1 << 20):
+        """
+        Yield the decompressed log as bytes blocks of whole lines,
+        roughly `block_size` each. Cheap to pickle to worker processes.
+        """
+        if not os.path.exists(self.path):
+            return
+        pieces, size = [], 0
+        for data in _decompress_members(self.path):
+            pieces.append(data)
+            size += len(data)
+            if size >= block_size:
+                data = b"".join(pieces)
+                cut = data.rfind(b"\n") + 1
+                if cut:
+                    yield data[:cut]
+                pieces = [data[cut:]]
+                size = len(pieces[0])
+        tail = b"".join(pieces)
+        if tail.strip():
+            yield tail
+
+    def entries(self):
+        """Iterate over logged entries, oldest first."""
+        for block in self.blocks():
+            yield from _decode_block(block)
+
+
+def _decompress_members(path, chunk_size=1 << 20, feed_size=1 << 12):
+    """
+    Decompressed bytes of a multi-member gzip file. A damaged or truncated
+    member ends with a newline and decoding resumes at the next member
+    header, instead of the whole rest of the file raising BadGzipFile.
+    """
+    with open(path, "rb") as f:
+        buf, base, pos = memoryview(b""), 0, 0  # buf holds the file from offset `base`
+        while True:
+            start = base + pos
+            member = zlib.decompressobj(wbits=31)
+            at_end = False
+            while not member.eof:
+                if pos == len(buf):
+                    base, buf, pos = base + len(buf), memoryview(f.read(chunk_size)), 0
+                    if not buf:
+                        at_end = True
+                        break
+                # Small pieces keep unused_data (copied at each member end) small
+                piece = buf[pos:pos + feed_size]
+                try:
+                    data = member.decompress(piece)
+                except zlib.error:
+                    break
+                pos += len(piece) - len(member.unused_data)
+                if data:
+                    yield data
+            if member.eof:
+                continue
+            if at_end and base + pos == start:
+                return  # end of file, between members
+            yield b"\n"  # end the damaged member's cut-off line
+            start = _next_member(f, start + 1)
+            if start is None:
+                return
+            f.seek(start)
+            buf, base, pos = memoryview(b""), start, 0
+
+
+def _next_member(f, offset, chunk_size=1 << 20):
+    """File offset of the next gzip member header at or after `offset`."""
+    f.seek(offset)
+    data = b""
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            return None
+        keep = data[-(len(_GZIP_MAGIC) - 1):]
+        offset += len(data) - len(keep)
+        data = keep + chunk
+        found = data.find(_GZIP_MAGIC)
+        if found >= 0:
+            return offset + found
+
+
+def _decode_block(block):
+    # One json.loads over the whole block is much faster than one per line
+    lines = [line for line in block.decode("utf-8", "replace").splitlines() if line.strip()]
+    try:
+        return json.loads("[" + ",".join(lines) + "]")
+    except ValueError:
+        pass
+    # A damaged member leaves a cut-off line: keep every line that parses
+    entries = []
+    for line in lines:
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(entry, dict):
+            entries.append(entry)
+    return entries
+
+# =====================================================
+# REPLAY
+# =====================================================
+
+def parse_entries(entries):
+    """
+    Parse log entries into (captured_at, values-or-None) pairs, where
+    values is (PM2.5, AQI, Category). Identical OCR strings are common
+    (same display, same value), so each distinct text is parsed once.
+    """
+    memo = {}
+    out = []
+    for entry in entries:
+        text = entry["text"]
+        values = memo.get(text, _MISSING)
+        if values is _MISSING:
+            # Only the values are memoised; the time comes from each entry
+            reading = parse_reading(text, timestamp=0.0)
+            values = memo[text] = None if reading is None else tuple(reading[1:])
+        out.append((entry["time"], values))
+    return out
+
+
+def _parse_block(block):
+    return parse_entries(_decode_block(block))
+
+
+def replay(log, workers=1):
+    """
+    Yield (captured_at, Reading-or-None) for every entry of an OCRLog, in
+    log order, using the current parser. With `workers` > 1, blocks are
+    decoded and parsed in a process pool.
+    """
+    if workers > 1:
+        from multiprocessing import Pool
+
+        with Pool(workers) as pool:
+            for parsed in pool.imap(_parse_block, log.blocks()):
+                yield from _to_readings(parsed)
+        return
+    for block in log.blocks():
+        yield from _to_readings(_parse_block(block))
+
+
+def _to_readings(parsed):
+    for captured_at, values in parsed:
+        epoch = None if values is None else _epoch_or_none(captured_at)
+        if epoch is None:
+            yield captured_at, None
+        else:
+            yield captured_at, Reading(epoch, *values)
+
+
+def _epoch_or_none(captured_at):
+    try:
+        return to_epoch(captured_at)
+    except ValueError:
+        return None
+
+# =====================================================
+# DIFF / MERGE AGAINST THE STORE
+# =====================================================
+
+def _group(readings):
+    groups = {}
+    for reading in readings:
+        groups.setdefault(reading.timestamp, []).append(reading)
+    return groups
+
+
+def _split(replayed):
+    """Logged epochs and the accepted readings from replay output."""
+    logged = set()
+    accepted = []
+    for captured_at, reading in replayed:
+        if reading is not None:
+            # Accepted readings already carry the parsed epoch
+            logged.add(reading.timestamp)
+            accepted.append(reading)
+            continue
+        epoch = _epoch_or_none(captured_at)
+        if epoch is not None:
+            logged.add(epoch)
+    return logged, accepted
+
+
+def diff_readings(stored, replayed):
+    """
+    Compare stored `Reading`s with replay output (pairs from `replay`).
+    Only timestamps present in the log are compared; readings that were
+    never OCR'd (manual ingest, legacy rows) are left out.
+    Returns {"added": [...], "removed": [...], "changed": [(old, new), ...]}.
+    """
+    logged, accepted = _split(replayed)
+    old = _group(r for r in stored if r.timestamp in logged)
+    new = _group(accepted)
+
+    added, removed, changed = [], [], []
+    for ts in sorted(logged):
+        before, after = old.get(ts, []), new.get(ts, [])
+        for a, b in zip(before, after):
+            if a != b:
+                changed.append((a, b))
+        removed.extend(before[len(after):])
+        added.extend(after[len(before):])
+    return {"added": added, "removed": removed, "changed": changed}
+
+
+def merge_readings(stored, replayed):
+    """
+    Stored rows (storage.rows()) with every logged timestamp replaced by
+    its replay result, as `Reading`s, sorted by timestamp so latest()/tail()
+    (which read the end of the file) stay correct. Undated legacy rows
+    can't be matched or sorted; they are kept as dicts, right after the
+    row they followed in the store.
+    """
+    logged, accepted = _split(replayed)
+    pending = _group(accepted)
+
+    kept = []
+    last = float("-inf")
+    for record in stored:
+        try:
+            reading = as_reading(record)
+        except (KeyError, TypeError, ValueError):
+            # Undated: keep the key of the row before it so it stays put
+            kept.append((last, record))
+            continue
+        last = reading.timestamp
+        if last not in logged:
+            kept.append((last, reading))
+        elif last in pending:
+            kept.extend((last, r) for r in pending.pop(last))
+    merged = kept + [(ts, reading) for ts in pending for reading in pending[ts]]
+    # Stable: an undated row stays behind the row whose key it took, and a
+    # stored reading stays ahead of a new one at the same time
+    merged.sort(key=lambda pair: pair[0])
+    return [item for _, item in merged]
@@ -0,0 +1,219 @@
+"""
+Streaming outlier filter between parse_reading and storage.
+
+Single OCR misreads ("85" read as "8.5" or "385") pass the 0–500 range
+check. `OutlierFilter` keeps a rolling window of recent PM2.5 values
+(by count and optionally by age) and scores each new reading with the
+robust modified z-score
+
+    z = 0.6745 * (x - median) / MAD
+
+flagging |z| > threshold (3.5 by default, Iglewicz & Hoaglin). Every
+reading, flagged or not, enters the window, so a genuine level change
+is accepted once it dominates the window instead of being rejected forever.
+
+The window is a sorted list maintained with bisect: median is O(1) and
+MAD is found in O(log n) by selecting the k-th smallest deviation from
+the two sorted runs on either side of the median, without materialising
+the deviations. Inserts and evictions are an O(log n) search plus a
+C-level memmove, which stays in the low microseconds for windows up to
+tens of thousands of readings.
+"""
+import bisect
+import os
+import time
+from collections import deque
+
+from .config import (
+    CSV_HEADER,
+    OUTLIER_MIN_MAD,
+    OUTLIER_MODE,
+    OUTLIER_MIN_SAMPLES,
+    OUTLIER_THRESHOLD,
+    OUTLIER_WINDOW,
+    QUARANTINE_FILE,
+)
+from .reading import as_reading
+from .storage import LocalStorage
+
+OUTLIER_MODES = ("off", "flag", "quarantine")
+
+# =====================================================
+# ROLLING MEDIAN / MAD
+# =====================================================
+
+class RollingWindow:
+    """Rolling window of floats with median and MAD queries."""
+
+    def __init__(self, size=OUTLIER_WINDOW, seconds=None):
+        self.size = size
+        self.seconds = seconds
+        self._sorted = []
+        self._order = deque()    # (epoch, value) in arrival order
+
+    def __len__(self):
+        return len(self._sorted)
+
+    def add(self, value, epoch=None):
+        if epoch is None:
+            epoch = time.time()
+        bisect.insort(self._sorted, value)
+        self._order.append((epoch, value))
+        while len(self._order) > self.size:
+            self._evict()
+        if self.seconds is not None:
+            cutoff = epoch - self.seconds
+            while self._order[0][0] < cutoff:
+                self._evict()
+
+    def _evict(self):
+        _, old = self._order.popleft()
+        del self._sorted[bisect.bisect_left(self._sorted, old)]
+
+    def median(self):
+        s = self._sorted
+        n = len(s)
+        if n == 0:
+            return None
+        mid = n // 2
+        return s[mid] if n % 2 else (s[mid - 1] + s[mid]) / 2
+
+    def mad(self):
+        """Median absolute deviation from the median."""
+        s = self._sorted
+        n = len(s)
+        if n == 0:
+            return None
+        m = self.median()
+        split = bisect.bisect_left(s, m)
+        mid = n // 2
+        if n % 2:
+            return self._kth_deviation(m, split, mid)
+        return (self._kth_deviation(m, split, mid - 1) + self._kth_deviation(m, split, mid)) / 2
+
+    def _kth_deviation(self, m, split, k):
+        """
+        k-th smallest (0-based) |x - m|. Deviations below the median are
+        A[i] = m - s[split-1-i], at/above it B[j] = s[split+j] - m; both
+        ascending, so binary-search how many of the k+1 smallest come from A.
+        """
+        s = self._sorted
+        len_a, len_b = split, len(s) - split
+        lo, hi = max(0, k + 1 - len_b), min(k + 1, len_a)
+        while lo < hi:
+            a = (lo + hi) // 2
+            b = k + 1 - a
+            # A[a] < B[b-1] means A[a] belongs among the k+1 smallest
+            if m - s[split - 1 - a] < s[split + b - 1] - m:
+                lo = a + 1
+            else:
+                hi = a
+        a, b = lo, k + 1 - lo
+        last_a = m - s[split - a] if a else float("-inf")
+        last_b = s[split + b - 1] - m if b else float("-inf")
+        return max(last_a, last_b)
+
+# =====================================================
+# VALIDATION STAGE
+# =====================================================
+
+class QuarantineStorage(LocalStorage):
+    """Readings held back by the outlier filter, with the reason."""
+
+    header = CSV_HEADER + ["Median", "MAD", "Score"]
+
+    def __init__(self, csv_path=QUARANTINE_FILE):
+        super().__init__(csv_path)
+
+
+class OutlierFilter:
+    """
+    Streaming validation stage:
+
+        result = parse_reading(raw_text)
+        result, flagged = outliers.process(result)
+        if result:
+            storage.save(result)
+
+    mode "flag" stores outliers normally and only reports them;
+    "quarantine" diverts them to a separate CSV instead of storage.
+    """
+
+    def __init__(
+        self,
+        mode="quarantine",
+        window=OUTLIER_WINDOW,
+        seconds=None,
+        threshold=OUTLIER_THRESHOLD,
+        min_samples=OUTLIER_MIN_SAMPLES,
+        min_mad=OUTLIER_MIN_MAD,
+        quarantine=None,
+    ):
+        if mode not in OUTLIER_MODES:
+            raise ValueError(f"mode must be one of {', '.join(OUTLIER_MODES)}")
+        self.mode = mode
+        self.window = RollingWindow(window, seconds)
+        self.threshold = threshold
+        self.min_samples = min_samples
+        self.min_mad = min_mad
+        self._quarantine = quarantine
+
+    @property
+    def quarantine(self):
+        if self._quarantine is None:
+            self._quarantine = QuarantineStorage()
+        return self._quarantine
+
+    def seed(self, readings):
+        """Prime the window with stored history (e.g. storage.tail_readings(window))."""
+        for reading in readings:
+            self.window.add(reading.pm25, reading.timestamp)
+
+    def process(self, record):
+        """
+        Score the reading (a Reading or record dict) against the current
+        window, add it to the window and return (record-or-None, flagged).
+        """
+        if record is None or self.mode == "off":
+            return record, False
+        reading = as_reading(record)
+        pm25 = reading.pm25
+        window = self.window
+        z = median = mad = None
+        if len(window) >= self.min_samples:
+            median = window.median()
+            z = 0.6745 * (pm25 - median) / self.min_mad
+            # MAD >= min_mad, so only readings that could still exceed the
+            # threshold need the (more expensive) MAD
+            if abs(z) > self.threshold:
+                mad = window.mad()
+                z = 0.6745 * (pm25 - median) / max(mad, self.min_mad)
+        window.add(pm25, reading.timestamp)
+
+        if z is None or abs(z) <= self.threshold:
+            return record, False
+        if self.mode == "quarantine":
+            self.quarantine.save({
+                **reading.to_dict(),
+                "Median": median,
+                "MAD": mad,
+                "Score": round(z, 2),
+            })
+            return None, True
+        return record, True
+
+
+def quarantined_timestamps(csv_path=QUARANTINE_FILE):
+    """Timestamps of quarantined readings (empty if there is no quarantine file)."""
+    if not os.path.exists(csv_path):
+        return set()
+    return {record["Timestamp"] for record in QuarantineStorage(csv_path).rows()}
+
+
+def seeded_filter(storage, mode=OUTLIER_MODE, **kwargs):
+    """OutlierFilter whose window is primed from the tail of `storage`."""
+    outliers = OutlierFilter(mode, **kwargs)
+    if mode != "off":
+        outliers.seed(storage.tail_readings(outliers.window.size))
+    return outliers
+
@@ -0,0 +1,89 @@
+"""
+OCR text normalization, PM2.5 extraction and reading validation.
+"""
+import re
+
+from .reading import Reading
+
+_OCR_CONFUSIONS = str.maketrans("SO", "50")
+_PM25_LABEL_RE = re.compile(r"(PM|MP)\s*2\s*\.?\s*5")
+_PM_PATTERNS = [
+    re.compile(r"PM2\.5\s*[: ]*\s*([0-9]+(?:\.[0-9]+)?)"),
+    re.compile(r"PM25\s*[: ]*\s*([0-9]+(?:\.[0-9]+)?)"),
+    re.compile(r"P25[A-Z]*\s*([0-9]+(?:\.[0-9]+)?)"),
+]
+_NUMBER_RE = re.compile(r"\b[0-9]{1,3}(?:\.[0-9]+)?\b")
+
+# =====================================================
+# TEXT NORMALIZATION
+# =====================================================
+
+def normalize_text(text):
+    """
+    Normalize OCR text:
+    - Uppercase
+    - Fix common OCR confusions (S->5, O->0)
+    - Collapse whitespace
+    - Normalize 'PM2.5' variants
+    """
+    text = text.upper().translate(_OCR_CONFUSIONS)
+    text = " ".join(text.split())
+    text = _PM25_LABEL_RE.sub("PM2.5", text)
+    return text
+
+# =====================================================
+# PM2.5 EXTRACTION (NO DIRECT AQI)
+# =====================================================
+
+def extract_pm25(text):
+    """
+    Extract PM2.5 numeric value from normalized text.
+    Tries labeled patterns first, then a safe fallback.
+    """
+    for pat in _PM_PATTERNS:
+        m = pat.search(text)
+        if m:
+            return float(m.group(1))
+
+    # Fallback: single standalone number in reasonable range
+    nums = [float(n) for n in _NUMBER_RE.findall(text)]
+    nums = [n for n in nums if 0 <= n <= 500]
+    if len(nums) == 1:
+        return nums[0]
+
+    return None
+
+# =====================================================
+# FILTER + VALIDATE FULL READING
+# =====================================================
+
+def parse_reading(raw_text, timestamp=None):
+    """
+    Turn raw OCR text into a Reading, or None if the text does not
+    contain a trustworthy PM2.5 value.
+    `timestamp` (epoch, datetime or stored text) defaults to now;
+    replay passes the original capture time.
+    """
+    text = normalize_text(raw_text)
+    pm25 = extract_pm25(text)
+
+    if pm25 is None:
+        return None
+
+    if not (0 <= pm25 <= 500):
+        return None
+
+    reading = Reading.create(pm25, timestamp)
+    if reading.aqi is None or not (0 <= reading.aqi <= 500):
+        return None
+
+    return reading
+
+
+def filter_and_validate(raw_text, timestamp=None):
+    """
+    Dict form of parse_reading ("Timestamp", "PM2.5", "AQI", "Status")
+    for callers that still work with records.
+    """
+    reading = parse_reading(raw_text, timestamp)
+    return reading.to_dict() if reading is not None else None
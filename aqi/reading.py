@@ -0,0 +1,227 @@
+"""
+Compact reading types.
+
+`Reading` is an immutable 4-field tuple (no per-instance dict):
+
+    timestamp  float     POSIX epoch seconds (as from time.time())
+    pm25       float     µg/m³
+    aqi        int
+    category   Category  IntEnum, one byte in a ReadingBatch
+
+`ReadingBatch` stores many readings column-wise in `array`s
+(19 bytes per reading) for bulk ingest and in-memory history.
+
+Dicts with "Timestamp"/"PM2.5"/"AQI"/"Status" remain the format at the
+edges (CSV rows, JSON, older callers); convert with `Reading.from_dict`,
+`Reading.to_dict` and `as_reading`. Stored timestamp text is local time,
+converted to and from epochs here.
+"""
+import bisect
+import time
+from array import array
+from datetime import datetime
+from typing import NamedTuple
+
+from .index import Category, aqi_category, compute_aqi_from_pm25
+
+
+def parse_timestamp(value):
+    """
+    Parse a stored timestamp ("YYYY-MM-DD HH:MM:SS" or "YYYY-MM-DD").
+    Returns None for legacy values such as "17:35" that carry no date.
+    """
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def to_epoch(value):
+    """
+    POSIX epoch for a datetime or stored timestamp string; naive values
+    are local time. Raises ValueError if the timestamp has no date.
+    """
+    ts = parse_timestamp(value)
+    if ts is None:
+        raise ValueError(f"timestamp has no date: {value!r}")
+    return ts.timestamp()
+
+
+def epoch_to_text(epoch):
+    """Stored "YYYY-MM-DD HH:MM:SS" local-time text for an epoch."""
+    return datetime.fromtimestamp(epoch).isoformat(sep=" ", timespec="seconds")
+
+
+def now_epoch():
+    return float(int(time.time()))
+
+# =====================================================
+# SINGLE READING
+# =====================================================
+
+class Reading(NamedTuple):
+    timestamp: float
+    pm25: float
+    aqi: int
+    category: Category
+
+    @classmethod
+    def create(cls, pm25, timestamp=None):
+        """
+        Reading for a PM2.5 value, with AQI and category computed.
+        `timestamp` is an epoch, a datetime or stored text (default now).
+        """
+        pm25 = float(pm25)
+        aqi = compute_aqi_from_pm25(pm25)
+        return cls(_as_epoch(timestamp), pm25, aqi, aqi_category(aqi))
+
+    @classmethod
+    def from_dict(cls, record):
+        """
+        Build from a "Timestamp"/"PM2.5"/"AQI"/"Status" dict. Extra keys
+        are ignored; a non-standard Status is re-derived from AQI.
+        Raises ValueError if the timestamp has no date.
+        """
+        aqi = int(record["AQI"])
+        category = Category.from_label(record.get("Status"))
+        if category is Category.UNKNOWN:
+            category = aqi_category(aqi)
+        return cls(to_epoch(record["Timestamp"]), float(record["PM2.5"]), aqi, category)
+
+    def recomputed(self):
+        """The same reading with AQI and category re-derived from PM2.5."""
+        aqi = compute_aqi_from_pm25(self.pm25)
+        return self._replace(aqi=aqi, category=aqi_category(aqi))
+
+    @property
+    def time_text(self):
+        return epoch_to_text(self.timestamp)
+
+    @property
+    def status(self):
+        return self.category.label
+
+    def to_dict(self):
+        return {
+            "Timestamp": self.time_text,
+            "PM2.5": self.pm25,
+            "AQI": self.aqi,
+            "Status": self.category.label,
+        }
+
+    def to_row(self):
+        """Values in CSV_HEADER order."""
+        return [self.time_text, self.pm25, self.aqi, self.category.label]
+
+
+def as_reading(record):
+    """Accept a Reading or an edge-format dict."""
+    if isinstance(record, Reading):
+        return record
+    return Reading.from_dict(record)
+
+
+def iter_readings(records):
+    """`Reading`s for stored records, skipping rows without a dated timestamp."""
+    for record in records:
+        try:
+            yield Reading.from_dict(record)
+        except (KeyError, TypeError, ValueError):
+            continue
+
+# =====================================================
+# BATCH
+# =====================================================
+
+class ReadingBatch:
+    """
+    Column-oriented readings: timestamps/pm25 as doubles, AQI as uint16,
+    category as uint8. Indexing yields `Reading`s; slicing yields batches.
+    """
+
+    __slots__ = ("timestamps", "pm25", "aqi", "category")
+
+    def __init__(self, readings=()):
+        self.timestamps = array("d")
+        self.pm25 = array("d")
+        self.aqi = array("H")
+        self.category = array("B")
+        self.extend(readings)
+
+    @classmethod
+    def from_dicts(cls, records):
+        """Batch from edge-format dicts; rows without a dated timestamp are skipped."""
+        return cls(iter_readings(records))
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __iter__(self):
+        for values in zip(self.timestamps, self.pm25, self.aqi, self.category):
+            yield Reading(values[0], values[1], values[2], Category(values[3]))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            batch = ReadingBatch()
+            batch.timestamps = self.timestamps[index]
+            batch.pm25 = self.pm25[index]
+            batch.aqi = self.aqi[index]
+            batch.category = self.category[index]
+            return batch
+        return Reading(
+            self.timestamps[index],
+            self.pm25[index],
+            self.aqi[index],
+            Category(self.category[index]),
+        )
+
+    def append(self, reading):
+        self.timestamps.append(reading[0])
+        self.pm25.append(reading[1])
+        self.aqi.append(reading[2] or 0)
+        self.category.append(reading[3])
+
+    def extend(self, readings):
+        for reading in readings:
+            self.append(reading)
+
+    def is_sorted(self):
+        ts = self.timestamps
+        return all(ts[i] <= ts[i + 1] for i in range(len(ts) - 1))
+
+    def between(self, start=None, end=None, assume_sorted=False):
+        """
+        Readings with start <= timestamp <= end (epochs, datetimes or
+        stored timestamp strings). Sorted batches are cut with bisect.
+        """
+        lo, hi = epoch_bounds(start, end)
+        if assume_sorted:
+            i = 0 if lo is None else bisect.bisect_left(self.timestamps, lo)
+            j = len(self) if hi is None else bisect.bisect_right(self.timestamps, hi)
+            return self[i:j]
+        return ReadingBatch(
+            r for r in self
+            if (lo is None or r.timestamp >= lo) and (hi is None or r.timestamp <= hi)
+        )
+
+    def to_dicts(self):
+        for reading in self:
+            yield reading.to_dict()
+
+
+def epoch_bounds(start=None, end=None):
+    """(lo, hi) epochs for optional range bounds (epochs, datetimes or text)."""
+    return (
+        None if start is None else _as_epoch(start),
+        None if end is None else _as_epoch(end),
+    )
+
+
+def _as_epoch(value):
+    if value is None:
+        return now_epoch()
+    if isinstance(value, (int, float)):
+        return float(value)
+    return to_epoch(value)
@@ -0,0 +1,492 @@
+"""
+Segmented, compressed CSV storage.
+
+Instead of one ever-growing CSV, readings are written to one segment per
+period (month by default) in a folder:
+
+    aqi_segments/
+        manifest.json
+        aqi_2025-10.csv.gz     sealed, compressed
+        aqi_2025-11.csv.gz
+        aqi_2025-12.csv        active, plain CSV (cheap appends)
+
+When a reading opens a new period, older plain segments are sealed
+(compressed with gzip, or zstd when available) and the retention policy
+runs: segments older than `drop_after` periods are deleted, and sealed
+segments older than `downsample_after` periods are reduced to hourly or
+daily means.
+
+manifest.json records each segment's file, time range, row count and
+state, so readers skip segments outside a requested range without opening
+them. Its "version" changes whenever files are sealed, rewritten or
+dropped; plain appends to the active segment leave it alone, which is what
+`follow()` relies on to read new rows incrementally.
+
+Rows whose timestamp has no date (legacy "17:35" values) go to a fixed
+`aqi_legacy.csv` segment that is never sealed, aged or dropped, so they
+cannot make a new period look like the newest one.
+
+Several processes may write to one store (the GUI and a cron `ingest`,
+say): each write holds an exclusive lock on `manifest.lock` and starts
+from the manifest on disk, never from a copy read earlier. Any number of
+processes may read it; readers never create files.
+"""
+import csv
+import gzip
+import json
+import os
+import shutil
+from datetime import date
+from itertools import islice
+from pathlib import Path
+
+from .config import (
+    CSV_HEADER,
+    RETENTION_DOWNSAMPLE_AFTER,
+    RETENTION_DOWNSAMPLE_TO,
+    RETENTION_DROP_AFTER,
+    SEGMENT_COMPRESSION,
+    SEGMENT_PERIOD,
+    SEGMENTS_DIR,
+    TIMESTAMP_FORMAT,
+)
+from .reading import (
+    Reading,
+    ReadingBatch,
+    as_reading,
+    epoch_bounds,
+    epoch_to_text,
+    iter_readings,
+    parse_timestamp,
+)
+from .storage import as_record, exclusive_lock, read_rows_from, reversed_rows, row_to_record
+
+MANIFEST_NAME = "manifest.json"
+LOCK_NAME = "manifest.lock"
+# Rows whose timestamp has no date (e.g. "17:35") can't be placed in a
+# period; they share one segment that is never rotated, aged or dropped
+LEGACY_SEGMENT = "legacy"
+# period / downsample bucket -> length of the "YYYY-MM-DD HH:MM:SS" prefix
+PERIOD_PREFIX = {"month": 7, "day": 10}
+DOWNSAMPLE_PREFIX = {"hour": 13, "day": 10}
+COMPRESSION_SUFFIX = {None: "", "gzip": ".gz", "zstd": ".zst"}
+
+
+def _zstd():
+    try:
+        from compression import zstd  # Python 3.14+
+    except ImportError:
+        try:
+            import zstandard as zstd
+        except ImportError:
+            raise RuntimeError(
+                "zstd segments need the 'zstandard' package "
+                "(pip install zstandard) or Python 3.14+"
+            ) from None
+    return zstd
+
+
+def _open(path, mode, compression=None):
+    """Open a plain, gzip or zstd segment in text mode ("r", "w", "a" or "x")."""
+    if compression is None:
+        return open(path, mode, newline="", encoding="utf-8")
+    if compression == "gzip":
+        return gzip.open(path, mode + "t", newline="", encoding="utf-8")
+    if compression == "zstd":
+        return _zstd().open(path, mode + "t", newline="", encoding="utf-8")
+    raise ValueError(f"unknown compression {compression!r}")
+
+
+def _segment_order(name):
+    """Sort key: the legacy segment first, then periods in time order."""
+    return (name != LEGACY_SEGMENT, name)
+
+
+def _period_index(name, period):
+    """Consecutive integer per period, so ages are simple differences."""
+    if period == "month":
+        year, month = name.split("-")
+        return int(year) * 12 + int(month)
+    return date.fromisoformat(name).toordinal()
+
+
+def downsample(records, to="hour"):
+    """
+    Replace readings with one mean Reading per hour/day. AQI and category
+    are recomputed from the mean PM2.5; rows without a full date are kept.
+    """
+    prefix = DOWNSAMPLE_PREFIX[to]
+    groups = {}
+    undated = []
+    for record in records:
+        try:
+            reading = as_reading(record)
+        except (KeyError, TypeError, ValueError):
+            undated.append(record)
+            continue
+        groups.setdefault(reading.time_text[:prefix], []).append(reading.pm25)
+
+    result = list(undated)
+    pad = "2000-01-01 00:00:00"
+    for key in sorted(groups):
+        values = groups[key]
+        result.append(Reading.create(round(sum(values) / len(values), 1), key + pad[prefix:]))
+    return result
+
+# =====================================================
+# SEGMENTED STORAGE
+# =====================================================
+
+class SegmentedStorage:
+    """Same interface as LocalStorage, backed by rotated segments."""
+
+    header = CSV_HEADER
+
+    def __init__(
+        self,
+        directory=SEGMENTS_DIR,
+        period=SEGMENT_PERIOD,
+        compression=SEGMENT_COMPRESSION,
+        drop_after=RETENTION_DROP_AFTER,
+        downsample_after=RETENTION_DOWNSAMPLE_AFTER,
+        downsample_to=RETENTION_DOWNSAMPLE_TO,
+    ):
+        if period not in PERIOD_PREFIX:
+            raise ValueError(f"period must be one of {', '.join(PERIOD_PREFIX)}")
+        if compression not in COMPRESSION_SUFFIX:
+            raise ValueError("compression must be one of gzip, zstd or None")
+        if downsample_to not in DOWNSAMPLE_PREFIX:
+            raise ValueError(f"downsample_to must be one of {', '.join(DOWNSAMPLE_PREFIX)}")
+        if compression == "zstd":
+            _zstd()  # fail now, not when the first segment is sealed
+        self.dir = Path(directory)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.dir / MANIFEST_NAME
+        self.compression = compression
+        self.drop_after = drop_after
+        self.downsample_after = downsample_after
+        self.downsample_to = downsample_to
+        self._load_manifest(default_period=period)
+        # An existing store keeps the layout it was created with
+        self.period = self.manifest["period"]
+
+    @property
+    def location(self):
+        return str(self.dir)
+
+    # ---------------- manifest ----------------
+
+    def _load_manifest(self, default_period=None):
+        """(Re)read manifest.json; another process may have changed it."""
+        if self.manifest_path.exists():
+            with self.manifest_path.open("r", encoding="utf-8") as f:
+                self.manifest = json.load(f)
+        else:
+            self.manifest = {"version": 0, "period": default_period or self.period, "segments": []}
+        self._entries = {entry["name"]: entry for entry in self.manifest["segments"]}
+
+    def _write_manifest(self):
+        self.manifest["segments"] = self.segments()
+        tmp = self.manifest_path.with_name(MANIFEST_NAME + ".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=1)
+        os.replace(tmp, self.manifest_path)
+
+    def _bump(self):
+        self.manifest["version"] += 1
+
+    def segments(self):
+        """Manifest entries, oldest segment first (the legacy segment leads)."""
+        return [self._entries[name] for name in sorted(self._entries, key=_segment_order)]
+
+    def dated_segments(self):
+        return [entry for entry in self.segments() if entry["name"] != LEGACY_SEGMENT]
+
+    def segment_key(self, timestamp):
+        ts = parse_timestamp(timestamp)
+        if ts is None:
+            return LEGACY_SEGMENT
+        return ts.strftime(TIMESTAMP_FORMAT)[:PERIOD_PREFIX[self.period]]
+
+    # ---------------- writing ----------------
+
+    def save(self, record):
+        """Append one Reading (or record dict) to its period's segment."""
+        self.save_many([record])
+        return record
+
+    def save_many(self, records):
+        """Append several readings, rotating if a new segment was opened."""
+        records = [as_record(record) for record in records]
+        with exclusive_lock(self.dir / LOCK_NAME):
+            self._load_manifest()
+            created = False
+            for record in records:
+                created |= self._append(record)
+            if created:
+                # Record the new segment before rotation touches other files
+                self._write_manifest()
+                self._rotate()
+            self._write_manifest()
+
+    def _append(self, record):
+        """Write one record to its segment; True if a segment was created."""
+        key = self.segment_key(record["Timestamp"])
+        entry = self._entries.get(key)
+        created = entry is None
+        if created:
+            entry = self._entries[key] = {
+                "name": key,
+                "file": f"aqi_{key}.csv",
+                "start": None,
+                "end": None,
+                "rows": 0,
+                "sealed": False,
+                "compression": None,
+            }
+            path = self.dir / entry["file"]
+            if path.exists():
+                # Written by an earlier run that failed before saving the
+                # manifest: adopt its rows instead of truncating them
+                self._update_stats(entry, self._read_segment(entry))
+            else:
+                with _open(path, "x") as f:
+                    csv.writer(f).writerow(self.header)
+            self._bump()
+
+        if entry["sealed"]:
+            # Late reading for an old period: rewrite that segment
+            self._write_segment(entry, list(self._read_segment(entry)) + [record])
+            self._bump()
+        else:
+            with _open(self.dir / entry["file"], "a") as f:
+                writer = csv.writer(f)
+                if f.tell() == 0:
+                    # The file is gone (deleted by hand): start it again
+                    # with its header rather than as headerless rows
+                    writer.writerow(self.header)
+                    entry.update(start=None, end=None, rows=0)
+                    self._bump()
+                writer.writerow([record[column] for column in self.header])
+            self._update_stats(entry, [record])
+            if key == LEGACY_SEGMENT:
+                self._bump()  # follow() only tails the newest segment
+        return created
+
+    def rewrite(self, records):
+        """Replace the whole store with the given records."""
+        records = [as_record(r) for r in records]  # may be a generator over this store
+        groups = {}
+        for record in records:
+            groups.setdefault(self.segment_key(record["Timestamp"]), []).append(record)
+
+        with exclusive_lock(self.dir / LOCK_NAME):
+            self._load_manifest()
+            old_files = {entry["file"] for entry in self._entries.values()}
+            self._entries = {}
+            for key in sorted(groups, key=_segment_order):
+                entry = self._entries[key] = {
+                    "name": key,
+                    "file": f"aqi_{key}.csv",
+                    "sealed": False,
+                    "compression": None,
+                }
+                self._write_segment(entry, groups[key])
+            self._bump()
+            self._rotate()
+            self._write_manifest()
+
+            keep = {entry["file"] for entry in self._entries.values()}
+            for name in old_files - keep:
+                (self.dir / name).unlink(missing_ok=True)
+
+    def _write_segment(self, entry, records):
+        """(Re)write a segment file atomically in its current format."""
+        records = [as_record(record) for record in records]
+        path = self.dir / entry["file"]
+        tmp = path.with_name(path.name + ".tmp")
+        with _open(tmp, "w", entry["compression"]) as f:
+            writer = csv.writer(f)
+            writer.writerow(self.header)
+            for record in records:
+                writer.writerow([record[key] for key in self.header])
+        os.replace(tmp, path)
+        entry.update(start=None, end=None, rows=0)
+        self._update_stats(entry, records)
+
+    def _update_stats(self, entry, records):
+        for record in records:
+            entry["rows"] += 1
+            ts = parse_timestamp(record["Timestamp"])
+            if ts is None:
+                continue
+            stamp = ts.strftime(TIMESTAMP_FORMAT)
+            if entry["start"] is None or stamp < entry["start"]:
+                entry["start"] = stamp
+            if entry["end"] is None or stamp > entry["end"]:
+                entry["end"] = stamp
+
+    def _rotate(self):
+        """Seal every plain dated segment except the newest, then apply retention."""
+        segments = self.dated_segments()
+        for entry in segments[:-1]:
+            if not entry["sealed"]:
+                self._seal(entry)
+        self.apply_retention()
+
+    def _seal(self, entry):
+        if self.compression is not None:
+            src = self.dir / entry["file"]
+            name = entry["file"] + COMPRESSION_SUFFIX[self.compression]
+            tmp = self.dir / (name + ".tmp")
+            with _open(src, "r") as fin, _open(tmp, "w", self.compression) as fout:
+                shutil.copyfileobj(fin, fout)
+            os.replace(tmp, self.dir / name)
+            src.unlink()
+            entry.update(file=name, compression=self.compression)
+        entry["sealed"] = True
+        self._bump()
+
+    def apply_retention(self):
+        """
+        Drop segments more than `drop_after` periods older than the newest
+        dated one and downsample sealed segments more than `downsample_after`
+        periods old. Runs automatically on rotation. The legacy segment of
+        undated rows is left alone.
+        """
+        segments = self.dated_segments()
+        if not segments:
+            return
+        newest = _period_index(segments[-1]["name"], self.period)
+        for entry in segments:
+            age = newest - _period_index(entry["name"], self.period)
+            if self.drop_after is not None and age > self.drop_after:
+                (self.dir / entry["file"]).unlink(missing_ok=True)
+                del self._entries[entry["name"]]
+                self._bump()
+            elif (
+                self.downsample_after is not None
+                and age > self.downsample_after
+                and entry["sealed"]
+                and entry.get("downsampled") != self.downsample_to
+            ):
+                rows = downsample(self._read_segment(entry), self.downsample_to)
+                self._write_segment(entry, rows)
+                entry["downsampled"] = self.downsample_to
+                self._bump()
+
+    # ---------------- reading ----------------
+
+    def _read_segment(self, entry):
+        with _open(self.dir / entry["file"], "r", entry["compression"]) as f:
+            for row in csv.DictReader(f):
+                yield row_to_record(row)
+
+    def rows(self):
+        """Iterate over all readings across segments, oldest segment first."""
+        self._load_manifest()
+        for entry in self.segments():
+            yield from self._read_segment(entry)
+
+    def readings(self, start=None, end=None):
+        """
+        Iterate over stored readings as `Reading`s with start <= timestamp
+        <= end, opening only the segments whose time range overlaps the
+        request. Undated rows are skipped.
+        """
+        lo, hi = epoch_bounds(start, end)
+        self._load_manifest()
+        lo_text = epoch_to_text(lo) if lo is not None else None
+        hi_text = epoch_to_text(hi) if hi is not None else None
+        for entry in self.dated_segments():
+            if entry["start"] is None:
+                continue  # no dated rows
+            if lo_text is not None and entry["end"] < lo_text:
+                continue
+            if hi_text is not None and entry["start"] > hi_text:
+                continue
+            for reading in iter_readings(self._read_segment(entry)):
+                if (lo is None or reading.timestamp >= lo) and (hi is None or reading.timestamp <= hi):
+                    yield reading
+
+    def load_batch(self, start=None, end=None):
+        """Stored readings (optionally a time range) as a ReadingBatch."""
+        return ReadingBatch(self.readings(start, end))
+
+    def _reversed_rows(self):
+        """Every stored row, newest first; the active segment is read backwards."""
+        self._load_manifest()
+        for entry in reversed(self.segments()):
+            if entry["sealed"]:
+                yield from reversed(list(self._read_segment(entry)))
+            else:
+                yield from reversed_rows(self.dir / entry["file"], self.header)
+
+    def tail_readings(self, n):
+        """The last `n` dated readings, oldest first."""
+        if n <= 0:
+            return []
+        readings = list(islice(iter_readings(self._reversed_rows()), n))
+        readings.reverse()
+        return readings
+
+    def latest_reading(self):
+        """Most recent dated reading, or None."""
+        readings = self.tail_readings(1)
+        return readings[0] if readings else None
+
+    # Dict views for the edges (see LocalStorage)
+
+    def latest(self):
+        records = self.tail(1)
+        return records[0] if records else None
+
+    def tail(self, n):
+        if n <= 0:
+            return []
+        records = list(islice(self._reversed_rows(), n))
+        records.reverse()
+        return records
+
+    def query(self, start=None, end=None):
+        if start is None and end is None:
+            yield from self.rows()
+            return
+        for reading in self.readings(start, end):
+            yield reading.to_dict()
+
+    def get_history(self):
+        """Number of stored readings, from the manifest."""
+        self._load_manifest()
+        return sum(entry["rows"] for entry in self._entries.values())
+
+    def follow(self, cursor=None):
+        """
+        Incremental reader for in-memory caches (see LocalStorage.follow).
+        The cursor is (manifest version, active segment, byte offset).
+        If a file disappears mid-read (a rotation in progress), nothing is
+        returned and the next call starts over from the new manifest.
+        """
+        self._load_manifest()
+        dated = self.dated_segments()
+        active = dated[-1] if dated and not dated[-1]["sealed"] else None
+        name = active["name"] if active else None
+        version = self.manifest["version"]
+
+        try:
+            if cursor is None or cursor[:2] != (version, name):
+                records = []
+                for entry in dated:
+                    if entry is not active:
+                        records.extend(self._read_segment(entry))
+                offset = 0
+                if active is not None:
+                    new, offset = read_rows_from(self.dir / active["file"], 0, self.header)
+                    records.extend(new)
+                return list(iter_readings(records)), (version, name, offset), True
+            if active is None:
+                return [], cursor, False
+            records, offset = read_rows_from(self.dir / active["file"], cursor[2], self.header)
+        except FileNotFoundError:
+            return [], None, False
+        return list(iter_readings(records)), (version, name, offset), False
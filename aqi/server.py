@@ -0,0 +1,335 @@
+"""
+Local HTTP read API for stored readings.
+
+    GET /latest                       most recent reading
+    GET /range?from=&to=[&format=csv] readings in a time range (inclusive)
+    GET /summary?bucket=hour|day|month per-bucket PM2.5/AQI aggregates
+
+Readings are held in memory by `ReadingCache`, which follows the store
+through `storage.follow()`: new appends are parsed incrementally, and a
+full reload happens only when the store is rewritten (e.g. by `recompute`). Every
+response carries an ETag derived from the cache version and a per-process
+nonce, so clients can revalidate with If-None-Match. Large ranges are
+streamed with chunked transfer encoding instead of being built in memory.
+
+The cache is a ReadingBatch (about 19 bytes per reading); legacy rows
+whose timestamp has no date cannot be placed in time and are not served.
+"""
+import csv
+import io
+import json
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from .config import CSV_HEADER
+from .reading import ReadingBatch, epoch_to_text, parse_timestamp
+
+# bucket -> length of the "YYYY-MM-DD HH:MM:SS" prefix that identifies it
+BUCKET_PREFIX = {
+    "hour": 13,
+    "day": 10,
+    "month": 7,
+}
+STREAM_THRESHOLD = 1000      # ranges with more rows than this are streamed
+STREAM_BATCH = 500           # rows per chunk when streaming
+RESPONSE_CACHE_SIZE = 256    # cached small response bodies per data version
+
+# =====================================================
+# IN-MEMORY CACHE
+# =====================================================
+
+class ReadingCache:
+    """
+    In-memory copy of the readings plus per-bucket aggregates.
+
+    `refresh()` is cheap to call on every request: it asks the storage
+    for changes at most once per `poll_interval` seconds, and only rows
+    appended since the last refresh are read.
+    """
+
+    def __init__(self, storage, poll_interval=0.25):
+        self.storage = storage
+        self.poll_interval = poll_interval
+        self.generation = 0
+        # Generations restart at 0 in every process; the nonce keeps a
+        # restarted server from reusing tags for a rewritten store
+        self.nonce = secrets.token_hex(4)
+        self._lock = threading.Lock()
+        self._checked = float("-inf")
+        self._cursor = None
+        self._reset()
+
+    def _reset(self):
+        self.readings = ReadingBatch()
+        self.in_order = True
+        self.summaries = {bucket: {} for bucket in BUCKET_PREFIX}
+        self.responses = {}
+
+    @property
+    def etag(self):
+        return f'"{self.nonce}-{self.generation}-{len(self.readings)}"'
+
+    def refresh(self, force=False):
+        now = time.monotonic()
+        if not force and now - self._checked < self.poll_interval:
+            return
+        with self._lock:
+            self._checked = now
+            readings, self._cursor, reset = self.storage.follow(self._cursor)
+            if reset:
+                self.generation += 1
+                self._reset()
+            if readings:
+                self._append(readings)
+                self.responses = {}
+
+    def _append(self, new):
+        readings = self.readings
+        block = iso = None
+        for reading in new:
+            epoch, pm25, aqi = reading.timestamp, reading.pm25, reading.aqi
+            if readings and epoch < readings.timestamps[-1]:
+                self.in_order = False
+            readings.append(reading)
+            # Local "YYYY-MM-DD HH" bucket text. UTC offsets and DST shifts
+            # are multiples of 15 minutes, so a 15-minute block never spans
+            # two local hours and is formatted once
+            if epoch // 900 != block:
+                block = epoch // 900
+                iso = epoch_to_text(epoch)[:13]
+            for bucket, prefix in BUCKET_PREFIX.items():
+                key = iso[:prefix]
+                agg = self.summaries[bucket].get(key)
+                if agg is None:
+                    # count, pm_sum, pm_min, pm_max, aqi_sum, aqi_max
+                    agg = self.summaries[bucket][key] = [0, 0.0, None, None, 0, None]
+                agg[0] += 1
+                agg[1] += pm25
+                agg[2] = pm25 if agg[2] is None else min(agg[2], pm25)
+                agg[3] = pm25 if agg[3] is None else max(agg[3], pm25)
+                agg[4] += aqi
+                agg[5] = aqi if agg[5] is None else max(agg[5], aqi)
+
+    def latest(self):
+        with self._lock:
+            return self.readings[-1] if self.readings else None
+
+    def range(self, start=None, end=None):
+        """Readings between two datetimes, as a ReadingBatch."""
+        with self._lock:
+            return self.readings.between(start, end, assume_sorted=self.in_order)
+
+    def summary(self, bucket):
+        with self._lock:
+            items = sorted(self.summaries[bucket].items())
+        return [
+            {
+                "bucket": key,
+                "count": count,
+                "pm25_mean": round(pm_sum / count, 2),
+                "pm25_min": pm_min,
+                "pm25_max": pm_max,
+                "aqi_mean": round(aqi_sum / count, 1),
+                "aqi_max": aqi_max,
+            }
+            for key, (count, pm_sum, pm_min, pm_max, aqi_sum, aqi_max) in items
+        ]
+
+    def cached_response(self, key):
+        return self.responses.get(key)
+
+    def store_response(self, key, etag, value):
+        with self._lock:
+            if etag != self.etag:
+                return
+            if len(self.responses) >= RESPONSE_CACHE_SIZE:
+                self.responses.pop(next(iter(self.responses)))
+            self.responses[key] = value
+
+# =====================================================
+# HTTP HANDLER
+# =====================================================
+
+def _csv_lines(records, header=True):
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    if header:
+        writer.writerow(CSV_HEADER)
+    for reading in records:
+        writer.writerow(reading.to_row())
+    return buf.getvalue()
+
+
+def _parse_bound(params, name):
+    value = params.get(name)
+    if not value:
+        return None
+    ts = parse_timestamp(value)
+    if ts is None:
+        raise ValueError(f"invalid '{name}' timestamp: {value!r}")
+    return ts
+
+
+class ReadingRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Buffer each response and send it without Nagle delays; headers and
+    # body written separately otherwise cost a delayed-ACK round trip.
+    wbufsize = -1
+    disable_nagle_algorithm = True
+    cache = None      # ReadingCache, set by make_server()
+    verbose = False
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        route = self.routes.get(url.path)
+        if route is None:
+            return self._send_error(404, f"unknown path {url.path}")
+
+        cache = self.cache
+        cache.refresh()
+        etag = cache.etag
+        if self._not_modified(etag):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        key = (url.path, url.query)
+        hit = cache.cached_response(key)
+        if hit is not None:
+            return self._send_body(*hit, etag=etag)
+
+        try:
+            params = dict(parse_qsl(url.query))
+            result = route(self, params)
+        except ValueError as e:
+            return self._send_error(400, str(e))
+        if result is None:
+            return  # streamed
+        status, content_type, body = result
+        if status == 200:
+            cache.store_response(key, etag, (status, content_type, body))
+        self._send_body(status, content_type, body, etag=etag)
+
+    # ---------------- routes ----------------
+
+    def route_latest(self, params):
+        record = self.cache.latest()
+        if record is None:
+            return 404, "application/json", b'{"error": "no readings"}'
+        return 200, "application/json", json.dumps(record.to_dict()).encode("utf-8")
+
+    def route_range(self, params):
+        fmt = params.get("format", "json")
+        if fmt not in ("json", "csv"):
+            raise ValueError(f"unknown format {fmt!r}")
+        records = self.cache.range(_parse_bound(params, "from"), _parse_bound(params, "to"))
+        if len(records) > STREAM_THRESHOLD:
+            self._stream(records, fmt)
+            return None
+        if fmt == "csv":
+            return 200, "text/csv; charset=utf-8", _csv_lines(records).encode("utf-8")
+        body = json.dumps(list(records.to_dicts())).encode("utf-8")
+        return 200, "application/json", body
+
+    def route_summary(self, params):
+        bucket = params.get("bucket", "hour")
+        if bucket not in BUCKET_PREFIX:
+            raise ValueError(f"bucket must be one of {', '.join(BUCKET_PREFIX)}")
+        body = json.dumps(self.cache.summary(bucket)).encode("utf-8")
+        return 200, "application/json", body
+
+    routes = {
+        "/latest": route_latest,
+        "/range": route_range,
+        "/summary": route_summary,
+    }
+
+    # ---------------- helpers ----------------
+
+    def _not_modified(self, etag):
+        header = self.headers.get("If-None-Match")
+        if not header:
+            return False
+        tags = [tag.strip() for tag in header.split(",")]
+        return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+    def _send_body(self, status, content_type, body, etag):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status, message):
+        body = json.dumps({"error": message}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self, records, fmt):
+        self.send_response(200)
+        if fmt == "csv":
+            self.send_header("Content-Type", "text/csv; charset=utf-8")
+        else:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.send_header("ETag", self.cache.etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        self._write_chunk(_csv_lines([]) if fmt == "csv" else "[")
+        for i in range(0, len(records), STREAM_BATCH):
+            batch = records[i:i + STREAM_BATCH]
+            if fmt == "csv":
+                text = _csv_lines(batch, header=False)
+            else:
+                text = ("," if i else "") + ",".join(json.dumps(r) for r in batch.to_dicts())
+            self._write_chunk(text)
+        if fmt == "json":
+            self._write_chunk("]")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _write_chunk(self, text):
+        data = text.encode("utf-8")
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+
+    def log_message(self, format, *args):
+        if self.verbose:
+            super().log_message(format, *args)
+
+# =====================================================
+# SERVER
+# =====================================================
+
+def make_server(storage, host="127.0.0.1", port=8000, verbose=False):
+    """Build a threaded HTTP server over a readings store."""
+    cache = ReadingCache(storage)
+    cache.refresh(force=True)
+    handler = type(
+        "BoundReadingRequestHandler",
+        (ReadingRequestHandler,),
+        {"cache": cache, "verbose": verbose},
+    )
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def serve(storage, host="127.0.0.1", port=8000, verbose=False):
+    server = make_server(storage, host, port, verbose)
+    print(f"🌐 Serving {storage.location} on http://{host}:{server.server_port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
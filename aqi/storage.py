@@ -0,0 +1,266 @@
+"""
+Local CSV storage for validated readings.
+"""
+import csv
+import os
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+
+from .config import CSV_FILE, CSV_HEADER, SEGMENTS_DIR
+from .index import classify_air_quality
+from .reading import Reading, ReadingBatch, epoch_bounds, iter_readings, parse_timestamp
+
+
+def row_to_record(row):
+    """Convert a raw CSV row (dict of strings) into a typed record."""
+    record = dict(row)
+    try:
+        record["PM2.5"] = float(record["PM2.5"])
+        record["AQI"] = int(record["AQI"])
+    except (KeyError, TypeError, ValueError):
+        pass
+    return record
+
+
+def as_record(record):
+    """
+    Dict form of a Reading or record for writing; fills in Status from
+    AQI if missing and the AQI is numeric.
+    """
+    if isinstance(record, Reading):
+        return record.to_dict()
+    if not record.get("Status") and isinstance(record.get("AQI"), (int, float)):
+        record["Status"] = classify_air_quality(record["AQI"])
+    return record
+
+
+def _lines_to_records(lines, header):
+    return [
+        row_to_record(dict(zip(header, values)))
+        for values in csv.reader(lines)
+        if values and values != header
+    ]
+
+
+def read_rows_from(path, offset=0, header=CSV_HEADER):
+    """
+    Records from the complete CSV lines after byte `offset` of `path`, and
+    the offset after the last complete line. Never creates the file.
+    """
+    with open(path, "rb") as f:
+        f.seek(offset)
+        data = f.read()
+    end = data.rfind(b"\n") + 1
+    return _lines_to_records(data[:end].decode("utf-8").splitlines(), header), offset + end
+
+
+def reversed_rows(path, header=CSV_HEADER, block_size=4096):
+    """
+    Records of a CSV, newest first, read backwards from the end of the
+    file one block at a time. Never creates the file.
+    """
+    with open(path, "rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        rest = b""
+        while pos > 0:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            lines = (f.read(step) + rest).split(b"\n")
+            # The first line may be cut in the middle: finish it next block
+            rest = lines.pop(0) if pos > 0 else b""
+            lines = [line.decode("utf-8") for line in reversed(lines) if line.strip()]
+            yield from _lines_to_records(lines, header)
+
+
+def tail_rows(path, n, header=CSV_HEADER, block_size=4096):
+    """The last `n` records of a CSV, oldest first."""
+    if n <= 0:
+        return []
+    records = list(islice(reversed_rows(path, header, block_size), n))
+    records.reverse()
+    return records
+
+
+@contextmanager
+def exclusive_lock(path):
+    """
+    Hold an exclusive lock on the lock file `path` (created if missing),
+    shared between processes, for the duration of the block.
+    """
+    with open(path, "a+b") as f:
+        if os.name == "nt":
+            import msvcrt
+
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+# =====================================================
+# LOCAL CSV STORAGE
+# =====================================================
+
+class LocalStorage:
+    header = CSV_HEADER
+
+    def __init__(self, csv_path=CSV_FILE):
+        self.file = Path(csv_path)
+        if not self.file.exists():
+            with self.file.open("w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(self.header)
+
+    @property
+    def location(self):
+        return str(self.file)
+
+    def save(self, record):
+        """Append one Reading (or record dict); returns it."""
+        self.save_many([record])
+        return record
+
+    def save_many(self, records):
+        """Append several readings with a single open of the file."""
+        with self.file.open("a", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            for record in records:
+                record = as_record(record)
+                writer.writerow([record[key] for key in self.header])
+
+    def get_history(self):
+        """Number of stored readings (header excluded)."""
+        try:
+            lines = 0
+            with self.file.open("rb") as f:
+                for chunk in iter(lambda: f.read(1 << 16), b""):
+                    lines += chunk.count(b"\n")
+            return max(lines - 1, 0)
+        except OSError:
+            return 0
+
+    def rows(self):
+        """
+        Every stored row as a typed record dict, oldest first, including
+        legacy rows without a dated timestamp. Used to rewrite/migrate the
+        file as-is; everything else reads `Reading`s.
+        """
+        with self.file.open("r", newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                yield row_to_record(row)
+
+    def readings(self, start=None, end=None):
+        """
+        Iterate over stored readings as `Reading`s with start <= timestamp
+        <= end (epochs, datetimes or ISO strings). Undated rows are skipped.
+        """
+        lo, hi = epoch_bounds(start, end)
+        for reading in iter_readings(self.rows()):
+            if (lo is None or reading.timestamp >= lo) and (hi is None or reading.timestamp <= hi):
+                yield reading
+
+    def load_batch(self, start=None, end=None):
+        """Stored readings (optionally a time range) as a ReadingBatch."""
+        return ReadingBatch(self.readings(start, end))
+
+    def tail_readings(self, n):
+        """
+        The last `n` dated readings, oldest first, read from the end of the
+        file; undated rows are passed over rather than counted.
+        """
+        if n <= 0:
+            return []
+        readings = list(islice(iter_readings(reversed_rows(self.file, self.header)), n))
+        readings.reverse()
+        return readings
+
+    def latest_reading(self):
+        """Most recent dated reading, or None."""
+        readings = self.tail_readings(1)
+        return readings[0] if readings else None
+
+    # Dict views for the edges (CLI/JSON output, older callers)
+
+    def latest(self):
+        """The last stored row as a record dict, dated or not."""
+        records = self.tail(1)
+        return records[0] if records else None
+
+    def tail(self, n):
+        """The last `n` stored rows as record dicts, oldest first."""
+        return tail_rows(self.file, n, self.header)
+
+    def query(self, start=None, end=None):
+        """
+        Record dicts for `readings(start, end)`; with no bounds, every
+        stored row (as `rows()`).
+        """
+        if start is None and end is None:
+            yield from self.rows()
+            return
+        for reading in self.readings(start, end):
+            yield reading.to_dict()
+
+    def read_from(self, offset=0):
+        """
+        Read the complete rows written after byte `offset`.
+        Returns (records, new_offset); a partially written last line is
+        left for the next call, so this can be used to follow appends.
+        """
+        return read_rows_from(self.file, offset, self.header)
+
+    def follow(self, cursor=None):
+        """
+        Incremental reader for in-memory caches. Returns
+        (readings, cursor, reset): with reset=True the readings are the whole
+        store (first call, or the file was replaced/truncated) and the
+        caller must drop what it had; otherwise they are new appends.
+        """
+        try:
+            st = os.stat(self.file)
+        except FileNotFoundError:
+            return [], cursor, False
+        file_id = (st.st_dev, st.st_ino)
+        if cursor is None or cursor[0] != file_id or st.st_size < cursor[1]:
+            records, offset = self.read_from(0)
+            return list(iter_readings(records)), (file_id, offset), True
+        if st.st_size > cursor[1]:
+            records, offset = self.read_from(cursor[1])
+            return list(iter_readings(records)), (file_id, offset), False
+        return [], cursor, False
+
+    def rewrite(self, records):
+        """Atomically replace the whole file with the given records."""
+        tmp = self.file.with_name(self.file.name + ".tmp")
+        with tmp.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(self.header)
+            for record in records:
+                record = as_record(record)
+                writer.writerow([record[key] for key in self.header])
+        os.replace(tmp, self.file)
+
+
+
+def open_storage(csv_path=CSV_FILE, segments_dir=SEGMENTS_DIR):
+    """
+    The configured readings store: a single CSV, or rotated compressed
+    segments (aqi/segments.py) when `segments_dir` is set.
+    """
+    if segments_dir:
+        from .segments import SegmentedStorage
+
+        return SegmentedStorage(segments_dir)
+    return LocalStorage(csv_path)
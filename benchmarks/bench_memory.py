@@ -0,0 +1,95 @@
+"""
+Memory benchmark for one million readings held in memory.
+
+Compares the edge dict format ({"Timestamp", "PM2.5", "AQI", "Status"}
+with a formatted timestamp string), a list of `Reading` tuples and a
+column-wise `ReadingBatch`, measured with tracemalloc.
+
+    python benchmarks/bench_memory.py [--readings 1000000]
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aqi.index import aqi_category, compute_aqi_from_pm25  # noqa: E402
+from aqi.reading import Reading, ReadingBatch, epoch_to_text, to_epoch  # noqa: E402
+
+START = to_epoch("2025-01-01 00:00:00")
+
+
+def values(n):
+    """Deterministic (epoch, pm25) pairs, one reading a minute."""
+    for i in range(n):
+        yield START + 60 * i, (i * 7919 % 5000) / 10
+
+
+def build_dicts(n):
+    out = []
+    for epoch, pm25 in values(n):
+        aqi = compute_aqi_from_pm25(pm25)
+        out.append({
+            "Timestamp": epoch_to_text(epoch),
+            "PM2.5": pm25,
+            "AQI": aqi,
+            "Status": aqi_category(aqi).label,
+        })
+    return out
+
+
+def build_readings(n):
+    out = []
+    for epoch, pm25 in values(n):
+        aqi = compute_aqi_from_pm25(pm25)
+        out.append(Reading(epoch, pm25, aqi, aqi_category(aqi)))
+    return out
+
+
+def build_batch(n):
+    batch = ReadingBatch()
+    for epoch, pm25 in values(n):
+        aqi = compute_aqi_from_pm25(pm25)
+        batch.append((epoch, pm25, aqi, aqi_category(aqi)))
+    return batch
+
+
+def measure(build, n):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    obj = build(n)
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return size, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--readings", type=int, default=1_000_000)
+    args = parser.parse_args()
+    n = args.readings
+
+    print(f"{n:,} readings")
+    baseline = None
+    for name, build in (
+        ("list of dicts", build_dicts),
+        ("list of Reading", build_readings),
+        ("ReadingBatch", build_batch),
+    ):
+        size, elapsed = measure(build, n)
+        baseline = baseline or size
+        print(
+            f"{name:16} {size / 1e6:8.1f} MB  {size / n:6.1f} B/reading  "
+            f"{baseline / size:5.1f}x smaller  (built in {elapsed:.1f} s)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
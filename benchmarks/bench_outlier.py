@@ -0,0 +1,50 @@
+"""
+Per-reading overhead of the streaming outlier filter.
+
+    python benchmarks/bench_outlier.py [--readings 200000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aqi.outlier import OutlierFilter  # noqa: E402
+from aqi.reading import Reading, to_epoch  # noqa: E402
+
+
+class _NullQuarantine:
+    def save(self, record):
+        return record
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--readings", type=int, default=200_000)
+    args = parser.parse_args()
+
+    start = to_epoch("2025-01-01 00:00:00")
+    records = []
+    for i in range(args.readings):
+        pm25 = round(random.gauss(60, 8), 1)
+        if random.random() < 0.01:
+            pm25 = random.choice([pm25 / 10, pm25 + 300])  # OCR misread
+        records.append(Reading.create(pm25, start + 60 * i))
+
+    for window in (50, 1_000, 10_000, 100_000):
+        outliers = OutlierFilter("quarantine", window=window, quarantine=_NullQuarantine())
+        outliers.seed(records[:window])
+        stream = records[window:] or records
+        start = time.perf_counter()
+        flagged = 0
+        for record in stream:
+            flagged += outliers.process(record)[1]
+        per = (time.perf_counter() - start) / len(stream) * 1e6
+        print(f"window={window:>7}: {per:6.2f} µs/reading, {flagged} quarantined")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
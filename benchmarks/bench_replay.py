@@ -0,0 +1,86 @@
+"""
+Replay throughput benchmark for the raw OCR log.
+
+Writes a synthetic log of noisy OCR strings one `append()` at a time, as
+OCR runs do, reports its size before and after `compact()`, then replays
+it through the current parser with 1 and N worker processes.
+
+    python benchmarks/bench_replay.py [--entries 200000] [--distinct 5000] [--workers 4]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aqi.config import OCR_CONFIG, TIMESTAMP_FORMAT  # noqa: E402
+from aqi.ocrlog import OCRLog, parse_entries, replay  # noqa: E402
+
+TEMPLATES = ["PM2.S  {v} AQI-{a}\n", "PM 2.5: {v}", "MP2.5 {v}\n\n", "{v}", "P25M {v} 0K"]
+
+
+def synthetic_texts(distinct):
+    texts = []
+    for _ in range(distinct):
+        value = random.choice([random.randint(0, 400), round(random.uniform(0, 400), 1)])
+        texts.append(random.choice(TEMPLATES).format(v=value, a=random.randint(0, 500)))
+    return texts
+
+
+def write_log(path, entries, distinct):
+    texts = synthetic_texts(distinct)
+    start = datetime(2025, 1, 1)
+    log = OCRLog(path)
+    for i in range(entries):
+        log.append(
+            random.choice(texts),
+            (start + timedelta(seconds=i)).strftime(TIMESTAMP_FORMAT),
+            "%064x" % random.getrandbits(256),
+            OCR_CONFIG,
+        )
+    return log
+
+
+def bench_parse(log):
+    entries = list(log.entries())
+    start = time.perf_counter()
+    parse_entries(entries)
+    return len(entries) / (time.perf_counter() - start)
+
+
+def bench_replay(log, workers):
+    start = time.perf_counter()
+    n = sum(1 for _ in replay(log, workers=workers))
+    return n / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=200_000)
+    parser.add_argument("--distinct", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "ocr_log.jsonl.gz")
+        start = time.perf_counter()
+        log = write_log(path, args.entries, args.distinct)
+        per = (time.perf_counter() - start) / args.entries * 1e6
+        start = time.perf_counter()
+        before, after = log.compact()
+        compact_s = time.perf_counter() - start
+        print(f"log: {args.entries} entries appended one at a time ({per:.0f} µs/append)")
+        print(f"  appended:  {before / 1e6:6.1f} MB ({before / args.entries:.1f} B/entry)")
+        print(f"  compacted: {after / 1e6:6.1f} MB ({after / args.entries:.1f} B/entry, {compact_s:.1f} s)")
+        print(f"parser only (in memory): {bench_parse(log):,.0f} strings/s")
+        for workers in sorted({1, args.workers}):
+            print(f"replay workers={workers}: {bench_replay(log, workers):,.0f} entries/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
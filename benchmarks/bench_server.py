@@ -0,0 +1,91 @@
+"""
+Throughput benchmark for the local HTTP read API.
+
+Starts the server in-process over a synthetic CSV, then hammers the hot
+endpoints from several client threads with keep-alive connections.
+
+    python benchmarks/bench_server.py [--rows 100000] [--seconds 5] [--clients 8]
+"""
+import argparse
+import http.client
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aqi.index import classify_air_quality, compute_aqi_from_pm25  # noqa: E402
+from aqi.server import make_server  # noqa: E402
+from aqi.storage import LocalStorage  # noqa: E402
+
+PATHS = [
+    "/latest",
+    "/summary?bucket=hour",
+    "/summary?bucket=day",
+    "/range?from=2025-01-02&to=2025-01-02%2006:00:00",
+]
+
+
+def write_csv(path, rows):
+    start = datetime(2025, 1, 1)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("Timestamp,PM2.5,AQI,Status\n")
+        for i in range(rows):
+            pm25 = round(random.uniform(0, 300), 1)
+            aqi = compute_aqi_from_pm25(pm25)
+            ts = (start + timedelta(minutes=i)).strftime("%Y-%m-%d %H:%M:%S")
+            f.write(f"{ts},{pm25},{aqi},{classify_air_quality(aqi)}\n")
+
+
+def client(port, deadline, counts, idx):
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    n = 0
+    while time.perf_counter() < deadline:
+        conn.request("GET", PATHS[n % len(PATHS)])
+        resp = conn.getresponse()
+        resp.read()
+        n += 1
+    conn.close()
+    counts[idx] = n
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--clients", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "aqi_readings.csv")
+        write_csv(csv_path, args.rows)
+
+        start = time.perf_counter()
+        server = make_server(LocalStorage(csv_path), port=0)
+        print(f"cache load: {args.rows} rows in {time.perf_counter() - start:.2f} s")
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        counts = [0] * args.clients
+        deadline = time.perf_counter() + args.seconds
+        threads = [
+            threading.Thread(target=client, args=(server.server_port, deadline, counts, i))
+            for i in range(args.clients)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        server.shutdown()
+        server.server_close()
+
+    total = sum(counts)
+    print(f"{total} requests in {args.seconds:.0f} s → {total / args.seconds:.0f} req/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
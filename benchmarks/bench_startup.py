@@ -0,0 +1,82 @@
+"""
+Cold-start benchmark for the headless CLI.
+
+Runs `python -m aqi latest` in fresh interpreters against a small
+temporary CSV and fails if the median wall time exceeds the target.
+Also checks that importing the CLI does not pull in the OCR/GUI stack.
+
+    python benchmarks/bench_startup.py [--runs 20] [--target-ms 100]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("pytesseract", "PIL", "tkinter")
+
+
+def heavy_imports():
+    code = (
+        "import sys, aqi.cli; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return [m for m in out.stdout.strip().split(",") if m]
+
+
+def time_cli(csv_path, runs):
+    cmd = [sys.executable, "-m", "aqi", "--csv", csv_path, "latest"]
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, cwd=ROOT, capture_output=True, check=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def time_bare_python(runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--target-ms", type=float, default=100.0)
+    args = parser.parse_args()
+
+    loaded = heavy_imports()
+    if loaded:
+        print(f"❌ aqi.cli imports heavy modules at startup: {', '.join(loaded)}")
+        return 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "aqi_readings.csv")
+        with open(csv_path, "w", encoding="utf-8") as f:
+            f.write("Timestamp,PM2.5,AQI,Status\n")
+            f.write("2025-12-23 17:38:00,85.0,166,Unhealthy\n")
+        cli = time_cli(csv_path, args.runs)
+    bare = time_bare_python(args.runs)
+
+    median = statistics.median(cli)
+    print(f"python -c pass      median {statistics.median(bare):7.1f} ms")
+    print(f"python -m aqi latest median {median:7.1f} ms  (target {args.target_ms:.0f} ms)")
+    if median > args.target_ms:
+        print("❌ CLI cold start is over target")
+        return 1
+    print("✅ CLI cold start within target")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
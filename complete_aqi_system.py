@@ -3,6 +3,9 @@ from pathlib import Path
 from typing import Dict, Any
 from datetime import datetime
 
+from aqi.reading import Reading
+from aqi.storage import LocalStorage, as_record
+
 # ═══════════════════════════════════════════════════════════════════════
 # MEMBER 3: DATA PROCESSING MODULE (PLANET.py - SIMPLIFIED)
 # ═══════════════════════════════════════════════════════════════════════
@@ -54,28 +57,17 @@ class LocalStorageManager:
         self.init_storage()
     
     def init_storage(self):
-        if not self.csv_file.exists():
-            with self.csv_file.open(mode="w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(["Timestamp", "PM2.5", "AQI", "Status"])
+        self.storage = LocalStorage(self.csv_file)
     
     def save_reading(self, record: Dict[str, Any]):
         # AUTO-REMOVE Location field
-        clean_record = {
-            "Timestamp": record.get("Timestamp", ""),
-            "PM2.5": record.get("PM2.5", ""),
-            "AQI": record.get("AQI", ""),
-            "Status": record.get("Status", "")
-        }
-        
-        with self.csv_file.open(mode="a", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                clean_record["Timestamp"],
-                clean_record["PM2.5"], 
-                clean_record["AQI"],
-                clean_record["Status"]
-            ])
+        clean_record = {key: record.get(key, "") for key in self.storage.header}
+        try:
+            # Dated rows map non-standard statuses like "Poor" to the AQI category
+            clean_record = Reading.from_dict(clean_record)
+        except (TypeError, ValueError):
+            pass  # undated ("17:35") or incomplete rows are stored as given
+        clean_record = as_record(self.storage.save(clean_record))
         print(f"✅ YOUR STORAGE SAVED: {clean_record}")
     
     def show_all_data(self):
@@ -0,0 +1,20 @@
+from aqi.cli import main
+
+
+def test_recompute_keeps_rows_with_non_numeric_pm25(tmp_path, capsys):
+    path = tmp_path / "r.csv"
+    path.write_text(
+        "Timestamp,PM2.5,AQI,Status\r\n"
+        "2025-01-01 10:00:00,abc,50,Good\r\n"
+        "17:35,35.0,1,Good\r\n"
+        "2025-01-01 11:00:00,35.0,1,Good\r\n",
+        newline="",
+    )
+
+    assert main(["--csv", str(path), "recompute"]) == 0
+    assert "3 readings, 2 changed, 1 skipped" in capsys.readouterr().err
+    assert path.read_text().splitlines()[1:] == [
+        "2025-01-01 10:00:00,abc,50,Good",
+        "17:35,35.0,99,Moderate",
+        "2025-01-01 11:00:00,35.0,99,Moderate",
+    ]
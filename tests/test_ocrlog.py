@@ -0,0 +1,132 @@
+import gzip
+
+from aqi.ocrlog import OCRLog, diff_readings, merge_readings, replay
+from aqi.reading import Reading
+
+
+def texts(log):
+    return [entry["text"] for entry in log.entries()]
+
+
+def append_range(log, values):
+    for value in values:
+        log.append(f"PM2.5 {value}", f"2025-01-01 00:00:{value:02d}")
+
+
+def test_truncated_member_does_not_hide_later_entries(tmp_path):
+    path = tmp_path / "ocr_log.jsonl.gz"
+    log = OCRLog(path)
+    append_range(log, range(3))
+    # A crash mid-append leaves half a gzip member behind
+    member = gzip.compress(b'{"time": "2025-01-01 00:00:09", "text": "PM2.5 9"}\n')
+    with open(path, "ab") as f:
+        f.write(member[: len(member) // 2])
+    append_range(log, range(3, 5))
+
+    assert texts(log) == [f"PM2.5 {value}" for value in range(5)]
+
+
+def test_corrupt_member_is_skipped(tmp_path):
+    path = tmp_path / "ocr_log.jsonl.gz"
+    log = OCRLog(path)
+    append_range(log, range(4))
+    data = bytearray(path.read_bytes())
+    # Damage the compressed data of the second member, just before its
+    # 8-byte CRC/size trailer
+    third = data.index(b"\x1f\x8b\x08", data.index(b"\x1f\x8b\x08", 1) + 1)
+    data[third - 10] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    assert texts(log) == ["PM2.5 0", "PM2.5 2", "PM2.5 3"]
+
+
+def test_compact_rewrites_one_smaller_member(tmp_path):
+    path = tmp_path / "ocr_log.jsonl.gz"
+    log = OCRLog(path)
+    append_range(log, range(50))
+    with open(path, "ab") as f:
+        f.write(b"\x1f\x8b\x08\x00garbage")
+
+    before, after = log.compact()
+    assert after < before / 4
+    assert path.read_bytes().count(b"\x1f\x8b\x08") == 1
+    assert texts(log) == [f"PM2.5 {value}" for value in range(50)]
+    assert OCRLog(tmp_path / "missing.gz").compact() == (0, 0)
+
+
+def row(timestamp, pm25):
+    return {"Timestamp": timestamp, "PM2.5": pm25, "AQI": 0, "Status": ""}
+
+
+def stamps(merged):
+    return [r["Timestamp"] if isinstance(r, dict) else r.time_text[11:] for r in merged]
+
+
+def test_merge_sorts_unordered_store_and_anchors_legacy_rows():
+    stored = [
+        row("17:35", 1.0),
+        row("2025-01-01 10:05:00", 10.0),
+        row("09:10", 2.0),
+        row("2025-01-01 09:00:00", 20.0),
+    ]
+    replayed = [
+        ("2025-01-01 09:30:00", Reading.create(30.0, "2025-01-01 09:30:00")),
+        ("2025-01-01 10:05:00", Reading.create(15.0, "2025-01-01 10:05:00")),
+    ]
+
+    merged = merge_readings(stored, replayed)
+    assert stamps(merged) == ["17:35", "09:00:00", "09:30:00", "10:05:00", "09:10"]
+    assert merged[3].pm25 == 15.0
+
+
+def test_merge_inserts_new_readings_in_order_and_keeps_unlogged_rows():
+    stored = [
+        row("2025-01-01 08:00:00", 5.0),  # manual ingest, never OCR'd
+        row("2025-01-01 09:00:00", 10.0),
+        row("17:35", 1.0),
+        row("2025-01-01 11:00:00", 30.0),
+    ]
+    replayed = [
+        ("2025-01-01 09:00:00", None),  # the parser now rejects it
+        ("2025-01-01 10:00:00", Reading.create(20.0, "2025-01-01 10:00:00")),
+        ("2025-01-01 12:00:00", Reading.create(40.0, "2025-01-01 12:00:00")),
+    ]
+
+    merged = merge_readings(stored, replayed)
+    assert stamps(merged) == ["08:00:00", "17:35", "10:00:00", "11:00:00", "12:00:00"]
+
+
+def test_diff_compares_logged_timestamps_only():
+    stored = [
+        Reading.create(5.0, "2025-01-01 08:00:00"),
+        Reading.create(10.0, "2025-01-01 09:00:00"),
+        Reading.create(30.0, "2025-01-01 11:00:00"),
+    ]
+    replayed = [
+        ("2025-01-01 09:00:00", None),
+        ("2025-01-01 10:00:00", Reading.create(20.0, "2025-01-01 10:00:00")),
+        ("2025-01-01 11:00:00", Reading.create(35.0, "2025-01-01 11:00:00")),
+    ]
+
+    diff = diff_readings(stored, replayed)
+    assert [r.pm25 for r in diff["removed"]] == [10.0]
+    assert [r.pm25 for r in diff["added"]] == [20.0]
+    assert [(old.pm25, new.pm25) for old, new in diff["changed"]] == [(30.0, 35.0)]
+
+
+def test_replay_with_workers_matches_serial(tmp_path):
+    log = OCRLog(tmp_path / "ocr_log.jsonl.gz")
+    entries = [
+        {"time": f"2025-01-01 {i // 60:02d}:{i % 60:02d}:00", "text": text}
+        for i, text in enumerate(["PM2.5 85", "PM2.S 12.5", "garbage", "PM 2.5: 40"] * 50)
+    ]
+    log.append_many(entries[:100])
+    log.append_many(entries[100:])
+
+    serial = list(replay(log))
+    assert len(serial) == 200
+    assert sum(reading is None for _, reading in serial) == 50
+    assert serial[0][1].pm25 == 85.0
+    # Small blocks so the pool really gets several of them
+    log.blocks = lambda block_size=1 << 20: OCRLog.blocks(log, 1 << 10)
+    assert list(replay(log, workers=2)) == serial
@@ -0,0 +1,71 @@
+import random
+import statistics
+
+import pytest
+
+from aqi.outlier import OutlierFilter, QuarantineStorage, RollingWindow
+
+
+def brute_mad(values):
+    m = statistics.median(values)
+    return statistics.median(abs(v - m) for v in values)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_median_and_mad_match_statistics(seed):
+    rng = random.Random(seed)
+    size = rng.randint(1, 60)
+    window = RollingWindow(size)
+    recent = []
+    for i in range(rng.randint(1, 200)):
+        value = rng.choice([rng.uniform(0, 500), float(rng.randint(0, 20))])
+        window.add(value, epoch=i)
+        recent = (recent + [value])[-size:]
+        assert window.median() == pytest.approx(statistics.median(recent))
+        assert window.mad() == pytest.approx(brute_mad(recent))
+
+
+def test_mad_with_duplicates_and_skew():
+    for values in ([5.0] * 7, [1.0, 1.0, 1.0, 100.0], [0.0, 0.0, 3.0, 3.0, 3.0, 50.0, 400.0]):
+        window = RollingWindow(len(values))
+        for i, value in enumerate(values):
+            window.add(value, epoch=i)
+        assert window.mad() == pytest.approx(brute_mad(values))
+
+
+def test_window_evicts_by_age():
+    window = RollingWindow(size=100, seconds=10)
+    for epoch in range(30):
+        window.add(float(epoch), epoch=epoch)
+    assert len(window) == 11
+    assert window.median() == 24.0
+
+
+def test_empty_window():
+    window = RollingWindow(5)
+    assert window.median() is None
+    assert window.mad() is None
+
+
+def _record(pm25, second):
+    return {"Timestamp": f"2025-01-01 00:00:{second:02d}", "PM2.5": pm25, "AQI": 0, "Status": ""}
+
+
+def test_quarantine_mode_diverts_outlier(tmp_path):
+    quarantine = QuarantineStorage(tmp_path / "q.csv")
+    outliers = OutlierFilter("quarantine", min_samples=5, quarantine=quarantine)
+    for second in range(10):
+        record = _record(20.0 + second % 3, second)
+        assert outliers.process(record) == (record, False)
+    result, flagged = outliers.process(_record(385.0, 10))
+    assert (result, flagged) == (None, True)
+    rows = list(quarantine.rows())
+    assert [row["PM2.5"] for row in rows] == [385.0]
+
+
+def test_flag_mode_keeps_outlier():
+    outliers = OutlierFilter("flag", min_samples=5)
+    for second in range(10):
+        outliers.process(_record(20.0, second))
+    record = _record(385.0, 10)
+    assert outliers.process(record) == (record, True)
@@ -0,0 +1,48 @@
+import time
+
+import pytest
+
+from aqi.index import Category
+from aqi.reading import Reading, ReadingBatch, epoch_to_text, to_epoch
+
+
+@pytest.fixture
+def kolkata(monkeypatch):
+    monkeypatch.setenv("TZ", "Asia/Kolkata")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_timestamps_are_posix_epochs(kolkata):
+    reading = Reading.from_dict({"Timestamp": "2025-01-01 05:30:00", "PM2.5": "12.5", "AQI": "52"})
+    assert reading.timestamp == 1735689600.0  # 2025-01-01 00:00:00 UTC
+    assert reading.time_text == "2025-01-01 05:30:00"
+    assert to_epoch(epoch_to_text(1735689600.0)) == 1735689600.0
+
+
+def test_create_accepts_time_time_and_coerces_pm25():
+    now = time.time()
+    reading = Reading.create("35.5", now)
+    assert reading.timestamp == now
+    assert type(reading.pm25) is float and reading.pm25 == 35.5
+    assert reading.category is Category.from_label(reading.status)
+    assert Reading.create(12).pm25 == 12.0
+
+
+def test_undated_rows_are_not_readings():
+    with pytest.raises(ValueError):
+        Reading.from_dict({"Timestamp": "17:35", "PM2.5": 12.0, "AQI": 50})
+    rows = [
+        {"Timestamp": "17:35", "PM2.5": 12.0, "AQI": 50, "Status": "Good"},
+        {"Timestamp": "2025-01-01 00:00:00", "PM2.5": 12.0, "AQI": 50, "Status": "Good"},
+    ]
+    assert len(ReadingBatch.from_dicts(rows)) == 1
+
+
+def test_batch_between_cuts_by_epoch():
+    batch = ReadingBatch(Reading.create(10, f"2025-01-0{day} 00:00:00") for day in range(1, 6))
+    picked = batch.between("2025-01-02", "2025-01-04 00:00:00", assume_sorted=True)
+    assert [r.time_text[:10] for r in picked] == ["2025-01-02", "2025-01-03", "2025-01-04"]
+    assert list(picked) == list(batch.between("2025-01-02", "2025-01-04 00:00:00"))
@@ -0,0 +1,165 @@
+import json
+
+import pytest
+
+from aqi.segments import SegmentedStorage
+
+
+def record(timestamp, pm25=10.0):
+    return {"Timestamp": timestamp, "PM2.5": pm25, "AQI": 42, "Status": "Good"}
+
+
+def names(storage):
+    return [entry["name"] for entry in storage.segments()]
+
+
+def test_rotation_seals_and_compresses_older_segments(tmp_path):
+    storage = SegmentedStorage(tmp_path, compression="gzip")
+    storage.save(record("2025-01-05 10:00:00"))
+    storage.save(record("2025-01-06 10:00:00"))
+    storage.save(record("2025-02-01 00:00:00"))
+
+    jan, feb = storage.segments()
+    assert (jan["sealed"], jan["file"], jan["rows"]) == (True, "aqi_2025-01.csv.gz", 2)
+    assert (feb["sealed"], feb["file"]) == (False, "aqi_2025-02.csv")
+    assert not (tmp_path / "aqi_2025-01.csv").exists()
+    assert [r["Timestamp"] for r in storage.rows()] == [
+        "2025-01-05 10:00:00", "2025-01-06 10:00:00", "2025-02-01 00:00:00",
+    ]
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    assert [entry["name"] for entry in manifest["segments"]] == ["2025-01", "2025-02"]
+
+
+def test_late_write_into_sealed_segment(tmp_path):
+    storage = SegmentedStorage(tmp_path)
+    storage.save(record("2025-01-05 10:00:00"))
+    storage.save(record("2025-02-01 00:00:00"))
+    storage.save(record("2025-01-20 00:00:00", pm25=30.0))
+
+    jan = storage.segments()[0]
+    assert jan["sealed"] and jan["rows"] == 2
+    assert jan["end"] == "2025-01-20 00:00:00"
+    assert [r["PM2.5"] for r in storage.query("2025-01-01", "2025-01-31")] == [10.0, 30.0]
+    assert storage.latest()["Timestamp"] == "2025-02-01 00:00:00"
+
+
+def test_retention_drops_and_downsamples(tmp_path):
+    storage = SegmentedStorage(tmp_path, drop_after=3, downsample_after=1)
+    for month in range(1, 7):
+        storage.save(record(f"2025-{month:02d}-01 10:00:00", pm25=10.0))
+        storage.save(record(f"2025-{month:02d}-01 10:30:00", pm25=20.0))
+
+    assert names(storage) == ["2025-03", "2025-04", "2025-05", "2025-06"]
+    by_name = {entry["name"]: entry for entry in storage.segments()}
+    assert by_name["2025-04"]["downsampled"] == "hour"
+    assert "downsampled" not in by_name["2025-05"]
+    assert [r["PM2.5"] for r in storage.query("2025-04-01", "2025-04-30")] == [15.0]
+    assert [r["PM2.5"] for r in storage.query("2025-05-01", "2025-05-31")] == [10.0, 20.0]
+
+
+def test_undated_rows_do_not_affect_retention(tmp_path):
+    storage = SegmentedStorage(tmp_path, drop_after=2)
+    for month in range(1, 6):
+        storage.save(record(f"2025-{month:02d}-01 00:00:00"))
+    storage.save(record("17:35"))
+
+    assert names(storage) == ["legacy", "2025-03", "2025-04", "2025-05"]
+    assert storage.get_history() == 4
+    storage.save(record("2025-05-02 00:00:00"))
+    assert storage.latest()["Timestamp"] == "2025-05-02 00:00:00"
+    assert not storage.segments()[0]["sealed"]
+
+
+def test_orphan_segment_is_adopted_not_truncated(tmp_path):
+    storage = SegmentedStorage(tmp_path)
+    storage.save(record("2025-04-01 00:00:00"))
+    # Left behind by a run that failed before writing the manifest
+    (tmp_path / "aqi_2025-05.csv").write_text(
+        "Timestamp,PM2.5,AQI,Status\n2025-05-01 00:00:00,20.0,68,Moderate\n"
+    )
+    storage.save(record("2025-05-02 00:00:00"))
+
+    assert [r["Timestamp"] for r in storage.query("2025-05-01")] == [
+        "2025-05-01 00:00:00", "2025-05-02 00:00:00",
+    ]
+    assert storage.segments()[-1]["rows"] == 2
+
+
+def test_zstd_unavailable_fails_at_open(tmp_path, monkeypatch):
+    import aqi.segments
+
+    def missing():
+        raise RuntimeError("no zstd")
+
+    monkeypatch.setattr(aqi.segments, "_zstd", missing)
+    with pytest.raises(RuntimeError):
+        SegmentedStorage(tmp_path / "store", compression="zstd")
+
+
+def test_follow_reads_appends_and_reloads_after_rotation(tmp_path):
+    storage = SegmentedStorage(tmp_path)
+    storage.save(record("2025-01-01 00:00:00"))
+    reader = SegmentedStorage(tmp_path)
+
+    records, cursor, reset = reader.follow()
+    assert reset and len(records) == 1
+
+    storage.save(record("2025-01-02 00:00:00"))
+    records, cursor, reset = reader.follow(cursor)
+    assert not reset and [r.time_text for r in records] == ["2025-01-02 00:00:00"]
+
+    storage.save(record("2025-02-01 00:00:00"))
+    records, cursor, reset = reader.follow(cursor)
+    assert reset and len(records) == 3
+
+    assert reader.follow(cursor) == ([], cursor, False)
+
+
+def test_follow_never_creates_files(tmp_path):
+    storage = SegmentedStorage(tmp_path)
+    storage.save(record("2025-01-01 00:00:00"))
+    (tmp_path / "aqi_2025-01.csv").unlink()
+
+    assert storage.follow() == ([], None, False)
+    with pytest.raises(FileNotFoundError):
+        storage.tail(1)
+    assert not (tmp_path / "aqi_2025-01.csv").exists()
+
+
+def test_second_writer_does_not_clobber_the_store(tmp_path):
+    gui = SegmentedStorage(tmp_path)
+    gui.save(record("2025-01-05 10:00:00"))
+    cli = SegmentedStorage(tmp_path)
+    cli.save(record("2025-02-01 00:00:00"))  # seals January to .gz
+    gui.save(record("2025-01-06 10:00:00"))  # late write from a stale writer
+
+    assert not (tmp_path / "aqi_2025-01.csv").exists()
+    assert [entry["file"] for entry in cli.segments()] == ["aqi_2025-01.csv.gz", "aqi_2025-02.csv"]
+    assert [r.time_text for r in SegmentedStorage(tmp_path).readings()] == [
+        "2025-01-05 10:00:00", "2025-01-06 10:00:00", "2025-02-01 00:00:00",
+    ]
+    assert gui.get_history() == cli.get_history() == 3
+
+
+def test_missing_active_segment_is_recreated_with_header(tmp_path):
+    storage = SegmentedStorage(tmp_path)
+    storage.save(record("2025-01-05 10:00:00"))
+    (tmp_path / "aqi_2025-01.csv").unlink()
+    storage.save(record("2025-01-06 10:00:00"))
+
+    assert (tmp_path / "aqi_2025-01.csv").read_text().startswith("Timestamp,")
+    assert [r.time_text for r in storage.readings()] == ["2025-01-06 10:00:00"]
+    assert storage.get_history() == 1
+
+
+def test_tail_readings_scans_past_undated_rows(tmp_path):
+    storage = SegmentedStorage(tmp_path)
+    storage.save(record("2025-01-05 10:00:00", pm25=10.0))
+    storage.save(record("2025-02-01 00:00:00", pm25=20.0))
+    storage.save(record("17:35", pm25=30.0))
+
+    assert [r.pm25 for r in storage.tail_readings(3)] == [10.0, 20.0]
+    assert storage.latest()["Timestamp"] == "2025-02-01 00:00:00"
+    assert [r["Timestamp"] for r in storage.tail(3)] == [
+        "17:35", "2025-01-05 10:00:00", "2025-02-01 00:00:00",
+    ]
@@ -0,0 +1,105 @@
+import http.client
+import json
+import threading
+
+import pytest
+
+from aqi.reading import Reading
+from aqi.server import STREAM_THRESHOLD, make_server
+from aqi.storage import LocalStorage
+
+
+@pytest.fixture
+def storage(tmp_path):
+    storage = LocalStorage(tmp_path / "r.csv")
+    storage.save_many([
+        Reading.create(10.0, "2025-01-01 10:05:00"),
+        Reading.create(20.0, "2025-01-01 10:40:00"),
+        Reading.create(40.0, "2025-01-01 11:00:00"),
+        Reading.create(30.0, "2025-01-02 09:00:00"),
+    ])
+    return storage
+
+
+@pytest.fixture
+def server(storage):
+    server = make_server(storage, port=0)
+    server.RequestHandlerClass.cache.poll_interval = 0
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def get(server, path, **headers):
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=5)
+    try:
+        conn.request("GET", path, headers=headers)
+        response = conn.getresponse()
+        return response.status, dict(response.getheaders()), response.read()
+    finally:
+        conn.close()
+
+
+def test_if_none_match_gets_304(server):
+    status, headers, body = get(server, "/latest")
+    assert status == 200 and json.loads(body)["PM2.5"] == 30.0
+
+    status, _, body = get(server, "/latest", **{"If-None-Match": headers["ETag"]})
+    assert status == 304 and body == b""
+
+
+def test_etag_changes_on_append_and_rewrite(server, storage):
+    first = get(server, "/latest")[1]["ETag"]
+    storage.save(Reading.create(50.0, "2025-01-02 10:00:00"))
+    status, headers, body = get(server, "/latest", **{"If-None-Match": first})
+    assert status == 200 and json.loads(body)["PM2.5"] == 50.0
+
+    second = headers["ETag"]
+    storage.rewrite(list(storage.rows())[:-1])
+    status, headers, body = get(server, "/latest", **{"If-None-Match": second})
+    assert status == 200 and json.loads(body)["PM2.5"] == 30.0
+    assert len({first, second, headers["ETag"]}) == 3
+
+
+def test_etag_is_unique_per_server(server, storage):
+    other = make_server(storage, port=0)
+    try:
+        assert other.RequestHandlerClass.cache.etag != get(server, "/latest")[1]["ETag"]
+    finally:
+        other.server_close()
+
+
+def test_large_range_is_streamed(server, storage):
+    start = Reading.create(5.0, "2025-02-01 00:00:00").timestamp
+    storage.save_many(Reading.create(5.0, start + 60 * i) for i in range(STREAM_THRESHOLD + 1))
+
+    status, headers, body = get(server, "/range?from=2025-02-01")
+    assert status == 200 and headers["Transfer-Encoding"] == "chunked"
+    assert len(json.loads(body)) == STREAM_THRESHOLD + 1
+
+    status, headers, body = get(server, "/range?from=2025-02-01&format=csv")
+    assert headers["Transfer-Encoding"] == "chunked"
+    assert len(body.decode().splitlines()) == STREAM_THRESHOLD + 2  # header row
+
+
+def test_small_range_is_not_streamed(server):
+    status, headers, body = get(server, "/range?from=2025-01-01%2010:30:00&to=2025-01-01%2023:59:59")
+    assert "Transfer-Encoding" not in headers
+    assert [r["PM2.5"] for r in json.loads(body)] == [20.0, 40.0]
+
+
+def test_summary_buckets(server):
+    hours = json.loads(get(server, "/summary?bucket=hour")[2])
+    assert [(b["bucket"], b["count"], b["pm25_mean"]) for b in hours] == [
+        ("2025-01-01 10", 2, 15.0),
+        ("2025-01-01 11", 1, 40.0),
+        ("2025-01-02 09", 1, 30.0),
+    ]
+    days = json.loads(get(server, "/summary?bucket=day")[2])
+    assert [(b["bucket"], b["count"], b["pm25_max"]) for b in days] == [
+        ("2025-01-01", 3, 40.0),
+        ("2025-01-02", 1, 30.0),
+    ]
+    assert get(server, "/summary?bucket=week")[0] == 400
@@ -0,0 +1,37 @@
+from aqi.storage import LocalStorage, reversed_rows, tail_rows
+
+HEADER = "Timestamp,PM2.5,AQI,Status\r\n"
+
+
+def write_csv(path, *rows):
+    path.write_text(HEADER + "".join(row + "\r\n" for row in rows), newline="")
+    return LocalStorage(path)
+
+
+def test_trailing_legacy_row_does_not_hide_dated_readings(tmp_path):
+    storage = write_csv(
+        tmp_path / "r.csv",
+        "2025-01-01 10:00:00,12.0,50,Good",
+        "2025-01-01 11:00:00,35.0,99,Moderate",
+        "17:35,82.5,115,Poor",
+    )
+    assert storage.latest() == {"Timestamp": "17:35", "PM2.5": 82.5, "AQI": 115, "Status": "Poor"}
+    assert storage.latest_reading().time_text == "2025-01-01 11:00:00"
+    assert [r.pm25 for r in storage.tail_readings(5)] == [12.0, 35.0]
+    assert [r["Timestamp"] for r in storage.tail(2)] == ["2025-01-01 11:00:00", "17:35"]
+
+
+def test_reversed_rows_across_blocks(tmp_path):
+    rows = [f"2025-01-01 10:{m:02d}:00,{m}.0,{m},Good" for m in range(60)]
+    path = tmp_path / "r.csv"
+    write_csv(path, *rows)
+
+    records = list(reversed_rows(path, block_size=7))
+    assert [r["PM2.5"] for r in records] == [float(m) for m in reversed(range(60))]
+    assert [r["AQI"] for r in tail_rows(path, 3, block_size=16)] == [57, 58, 59]
+
+
+def test_unbounded_query_keeps_legacy_rows(tmp_path):
+    storage = write_csv(tmp_path / "r.csv", "17:35,82.5,115,Poor", "2025-01-01 10:00:00,12.0,50,Good")
+    assert [r["Timestamp"] for r in storage.query()] == ["17:35", "2025-01-01 10:00:00"]
+    assert [r["Timestamp"] for r in storage.query("2025-01-01")] == ["2025-01-01 10:00:00"]